@@ -1,53 +1,93 @@
-import pandas as pd
+from collections import Counter
 from pathlib import Path
 import json
+import os
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson es opcional: usar json estándar si no está
+    json_loads = json.loads
 
 def check_file_dates(filepath):
     """Verifica fechas mínima y máxima de un archivo JSON"""
     print(f"\n📁 Archivo: {filepath.name}")
     
     try:
-        # Leer archivo JSON Lines
-        df = pd.read_json(filepath, lines=True)
+        # Recorrer el archivo JSON Lines en una sola pasada
+        total = 0
+        min_date = max_date = None
+        location = None
+        columns = {}
+        # Valores no nulos por columna: una clave ausente en un registro
+        # cuenta como nulo, igual que al armar un DataFrame
+        non_null_counts = Counter()
+        
+        with open(filepath, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json_loads(line)
+                total += 1
+                
+                # Fechas ISO: la comparación lexicográfica respeta el orden
+                date = record.get('date')
+                if date is not None:
+                    if min_date is None or date < min_date:
+                        min_date = date
+                    if max_date is None or date > max_date:
+                        max_date = date
+                
+                if location is None:
+                    location = record.get('location')
+                
+                for col, value in record.items():
+                    columns[col] = None
+                    if value is not None:
+                        non_null_counts[col] += 1
         
-        if df.empty:
+        if total == 0:
             print("   ❌ Archivo vacío")
             return
         
-        # Convertir fechas
-        df['date'] = pd.to_datetime(df['date'])
-        
         # Estadísticas
-        print(f"   📊 Total registros: {len(df)}")
-        print(f"   📅 Fecha mínima: {df['date'].min().strftime('%Y-%m-%d')}")
-        print(f"   📅 Fecha máxima: {df['date'].max().strftime('%Y-%m-%d')}")
-        print(f"   🌍 Ubicación: {df['location'].iloc[0]}")
+        print(f"   📊 Total registros: {total}")
+        if min_date is None:
+            print("   ⚠️  Sin fechas en el archivo")
+        else:
+            print(f"   📅 Fecha mínima: {min_date[:10]}")
+            print(f"   📅 Fecha máxima: {max_date[:10]}")
+        print(f"   🌍 Ubicación: {location}")
         
         # Verificar variables meteorológicas
-        weather_vars = [col for col in df.columns if col not in ['date', 'location']]
+        weather_vars = [col for col in columns if col not in ['date', 'location']]
         print(f"   🌡️  Variables: {len(weather_vars)} ({', '.join(weather_vars[:3])}...)")
         
         # Verificar datos nulos
-        null_counts = df.isnull().sum()
-        if null_counts.sum() > 0:
+        null_counts = {col: total - non_null_counts[col] for col in columns}
+        if any(null_counts.values()):
             print(f"   ⚠️  Datos nulos encontrados:")
-            for col, nulls in null_counts[null_counts > 0].items():
-                print(f"      {col}: {nulls} nulos")
+            for col, nulls in null_counts.items():
+                if nulls > 0:
+                    print(f"      {col}: {nulls} nulos")
         else:
             print(f"   ✅ Sin datos nulos")
-            
+    
     except Exception as e:
         print(f"   ❌ Error leyendo archivo: {e}")
 
 # Verificar todos los archivos
 data_dir = Path("data/raw")
-json_files = list(data_dir.glob("*.json"))
+json_files = sorted(
+    Path(entry.path) for entry in os.scandir(data_dir)
+    if entry.name.endswith(".json") and entry.is_file()
+)
 
 print("🔍 VERIFICACIÓN DE DATOS GENERADOS")
 print("=" * 50)
 
-for json_file in sorted(json_files):
+for json_file in json_files:
     check_file_dates(json_file)
 
 print("\n" + "=" * 50)
-print("✅ Verificación completada")
\ No newline at end of file
+print("✅ Verificación completada")
@@ -0,0 +1,68 @@
+"""
+Benchmark de page_size para la carga con execute_values
+Mide el tiempo de inserción de un archivo de muestra con distintos tamaños
+de página. Cada corrida se hace en una transacción que luego se revierte,
+por lo que todas insertan las mismas filas sobre el mismo estado de la tabla
+(usar una base recién creada con 01_create_tables.sql).
+
+Uso: python bench_page_size.py [archivo.json]
+"""
+
+import os
+import sys
+import time
+
+from load_data import (
+    DATA_PATH, build_weather_rows, connect_db, insert_locations,
+    insert_weather_rows, load_json_file
+)
+
+PAGE_SIZES = [100, 500, 1000, 2500, 5000, 10000]
+REPEATS = 3
+
+
+def bench(conn, rows, page_size):
+    """Retorna el mejor tiempo (segundos) de REPEATS inserciones revertidas"""
+    best = float('inf')
+    for _ in range(REPEATS):
+        cursor = conn.cursor()
+        try:
+            start = time.perf_counter()
+            insert_weather_rows(cursor, rows, page_size=page_size)
+            best = min(best, time.perf_counter() - start)
+        finally:
+            conn.rollback()
+            cursor.close()
+    return best
+
+
+def main():
+    """Ejecuta el benchmark e imprime el page_size más rápido"""
+    filepath = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+        DATA_PATH, "historical_iowa_center_2025-09-27.json"
+    )
+    rows = list(build_weather_rows(load_json_file(filepath), 'historical'))
+    if not rows:
+        print(f"Sin registros en {filepath}")
+        sys.exit(1)
+    
+    conn = connect_db()
+    try:
+        insert_locations(conn)
+        print(f"\n{len(rows)} filas de {os.path.basename(filepath)}\n")
+        print(f"{'page_size':>10} {'tiempo (s)':>12}")
+        print("-" * 23)
+        
+        results = {}
+        for page_size in PAGE_SIZES:
+            results[page_size] = bench(conn, rows, page_size)
+            print(f"{page_size:>10} {results[page_size]:>12.4f}")
+        
+        best = min(results, key=results.get)
+        print(f"\nMejor page_size: {best}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,10 +5,18 @@ Carga datos históricos y pronósticos desde archivos JSON a PostgreSQL
 
 import json
 import psycopg2
-from psycopg2.extras import execute_batch
+from psycopg2.extras import execute_batch, execute_values
 import os
 import sys
-from datetime import datetime
+import time
+from concurrent.futures import ProcessPoolExecutor
+from operator import itemgetter
+
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:  # orjson es opcional: usar json estándar si no está
+    json_loads = json.loads
 
 # Configuración de conexión a PostgreSQL
 DB_CONFIG = {
@@ -28,11 +36,55 @@ LOCATIONS = {
     'illinois_center': 2
 }
 
+# Columnas de weather_data que se cargan desde los archivos JSON
+WEATHER_COLUMNS = (
+    'location_id', 'date', 'data_type', 'weather_code',
+    'temperature_2m_max', 'temperature_2m_min', 'daylight_duration',
+    'shortwave_radiation_sum', 'precipitation_sum',
+    'et0_fao_evapotranspiration', 'soil_moisture_0_to_100cm_mean',
+    'vapour_pressure_deficit_max'
+)
+
+# Variables meteorológicas tomadas tal cual de cada registro JSON
+WEATHER_FIELDS = WEATHER_COLUMNS[3:]
+get_weather_fields = itemgetter(*WEATHER_FIELDS)
+
+# Índices secundarios de weather_data (definidos en 01_create_tables.sql).
+# Se eliminan durante la carga y se recrean al final; el constraint único
+# unique_location_date_type se mantiene porque lo usa ON CONFLICT.
+SECONDARY_INDEXES = {
+    'idx_weather_date': 'weather_data(date)',
+    'idx_weather_location_type': 'weather_data(location_id, data_type)',
+    'idx_weather_location_date': 'weather_data(location_id, date)',
+    'idx_weather_type_loc_date': (
+        'weather_data(data_type, location_id, date) '
+        'INCLUDE (temperature_2m_max, temperature_2m_min, precipitation_sum)'
+    ),
+}
+
+# Procesos en paralelo para la carga de archivos (una conexión por proceso)
+MAX_WORKERS = 4
+
+# Filas por sentencia INSERT ... VALUES. Se mantiene el valor previo: contra
+# PostgreSQL local (socket Unix) bench_page_size.py no mostró diferencias
+# entre 100 y 10000; medir contra la base real antes de cambiarlo
+PAGE_SIZE = 500
+
+# Método de carga masiva: 'copy' (COPY + staging), 'values' (execute_values)
+# o 'prepared' (sentencia preparada por conexión + execute_batch)
+LOAD_METHOD = 'copy'
+
+
+# Último timestamp formateado por log(): [segundo epoch, texto]
+_log_timestamp = [0, '']
+
 
 def log(message):
-    """Función helper para logging con timestamp"""
-    timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    print(f"[{timestamp}] {message}")
+    """Función helper para logging con timestamp (formateado una vez por segundo)"""
+    now = int(time.time())
+    if now != _log_timestamp[0]:
+        _log_timestamp[:] = [now, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))]
+    print(f"[{_log_timestamp[1]}] {message}")
 
 
 def connect_db():
@@ -91,11 +143,22 @@ def drop_foreign_key(conn):
 
 
 def recreate_foreign_key(conn):
-    """Recrea la foreign key constraint"""
+    """Recrea la foreign key constraint (si no existe ya)"""
     log("Recreando constraint fk_weather_location...")
     cursor = conn.cursor()
     
     try:
+        # Puede seguir existiendo si la carga falló antes de removerla
+        cursor.execute("""
+            SELECT 1 FROM pg_constraint
+            WHERE conname = 'fk_weather_location'
+              AND conrelid = 'weather_data'::regclass
+        """)
+        if cursor.fetchone():
+            conn.commit()
+            log("✓ Constraint ya existente")
+            return
+        
         cursor.execute("""
             ALTER TABLE weather_data 
             ADD CONSTRAINT fk_weather_location 
@@ -112,82 +175,325 @@ def recreate_foreign_key(conn):
         cursor.close()
 
 
+def drop_secondary_indexes(conn):
+    """Remueve temporalmente los índices secundarios de weather_data"""
+    log("Removiendo índices secundarios...")
+    cursor = conn.cursor()
+    
+    try:
+        for index_name in SECONDARY_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {index_name}")
+        conn.commit()
+        log(f"✓ {len(SECONDARY_INDEXES)} índices removidos temporalmente")
+    except psycopg2.Error as e:
+        log(f"✗ Error removiendo índices: {e}")
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def recreate_secondary_indexes(conn):
+    """
+    Recrea los índices secundarios con CREATE INDEX CONCURRENTLY (no bloquea
+    las lecturas del reporter) y actualiza las estadísticas de la tabla
+    """
+    log("Recreando índices secundarios...")
+    # CREATE INDEX CONCURRENTLY no puede ejecutarse dentro de una transacción
+    conn.autocommit = True
+    cursor = conn.cursor()
+    
+    try:
+        # Un CREATE INDEX CONCURRENTLY interrumpido deja el índice INVALID y
+        # IF NOT EXISTS lo conservaría: se eliminan antes de recrearlos
+        cursor.execute("""
+            SELECT c.relname
+            FROM pg_index i
+            JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = 'weather_data'::regclass
+              AND NOT i.indisvalid
+              AND c.relname = ANY(%s)
+        """, (list(SECONDARY_INDEXES),))
+        for (index_name,) in cursor.fetchall():
+            log(f"  Eliminando índice inválido {index_name}")
+            cursor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {index_name}")
+        
+        for index_name, definition in SECONDARY_INDEXES.items():
+            cursor.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {index_name} ON {definition}"
+            )
+        cursor.execute("ANALYZE weather_data")
+        log(f"✓ {len(SECONDARY_INDEXES)} índices recreados exitosamente")
+    except psycopg2.Error as e:
+        log(f"✗ Error recreando índices: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.autocommit = False
+
+
+def refresh_monthly_view(conn):
+    """Refresca la vista materializada mensual usada por el reporter"""
+    log("Refrescando vista materializada mv_weather_monthly...")
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("REFRESH MATERIALIZED VIEW CONCURRENTLY mv_weather_monthly")
+        conn.commit()
+        log("✓ Vista materializada actualizada")
+    except psycopg2.Error as e:
+        log(f"✗ Error refrescando vista materializada: {e}")
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
 def load_json_file(filepath):
-    """Lee un archivo JSONL y retorna lista de registros"""
-    records = []
+    """
+    Lee un archivo JSONL y genera sus registros de a uno
+    
+    Es un generador: el archivo se parsea a medida que se consume, sin
+    materializar la lista completa de registros en memoria. Los errores de
+    parseo se propagan a quien consume (ver load_file).
+    """
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            for line in f:
-                if line.strip():  # Ignorar líneas vacías
-                    records.append(json.loads(line))
-        return records
+        f = open(filepath, 'rb')
     except FileNotFoundError:
         log(f"✗ Archivo no encontrado: {filepath}")
-        return []
-    except json.JSONDecodeError as e:
-        log(f"✗ Error parseando JSON en {filepath}: {e}")
-        return []
+        return
+    
+    with f:
+        for line in f:
+            if line.strip():  # Ignorar líneas vacías
+                yield json_loads(line)
+
+
+def copy_value(value):
+    """Formatea un valor para COPY en formato texto (NULL como \\N)"""
+    if value is None:
+        return '\\N'
+    return (str(value)
+            .replace('\\', '\\\\')
+            .replace('\t', '\\t')
+            .replace('\n', '\\n')
+            .replace('\r', '\\r'))
+
+
+def build_weather_rows(records, data_type):
+    """Genera tuplas con el orden de WEATHER_COLUMNS a partir de los registros JSON"""
+    location_lookup = LOCATIONS.get
+    
+    for record in records:
+        location_id = location_lookup(record['location'])
+        if not location_id:
+            log(f"⚠ Ubicación desconocida: {record['location']}")
+            continue
+        
+        try:
+            values = get_weather_fields(record)
+        except KeyError:
+            # Variables ausentes en el registro se cargan como NULL
+            values = tuple(map(record.get, WEATHER_FIELDS))
+        
+        yield (location_id, record['date'], data_type) + values
 
 
-def insert_weather_data(conn, records, data_type):
+class CopyStream:
+    """
+    Objeto tipo archivo para copy_expert que genera el texto TSV de COPY a
+    medida que PostgreSQL lo lee, en lugar de armar todo el buffer en memoria
     """
-    Inserta registros de clima en la tabla weather_data usando batch insert
+    
+    def __init__(self, rows):
+        self.lines = ('\t'.join(map(copy_value, row)) + '\n' for row in rows)
+        self.pending = ''
+        # psycopg2 envuelve las excepciones de read() en un error de COPY:
+        # se guarda la original para poder relanzarla (ver copy_weather_rows)
+        self.error = None
+    
+    def read(self, size=-1):
+        chunks = [self.pending]
+        length = len(self.pending)
+        try:
+            for line in self.lines:
+                chunks.append(line)
+                length += len(line)
+                if 0 <= size <= length:
+                    break
+        except Exception as e:
+            self.error = e
+            raise
+        
+        data = ''.join(chunks)
+        if size < 0:
+            self.pending = ''
+            return data
+        self.pending = data[size:]
+        return data[:size]
+
+
+def copy_weather_rows(cursor, rows):
+    """
+    Carga filas con COPY a una tabla temporal de staging y luego las inserta
+    en weather_data con un único INSERT ... SELECT, ya que COPY no soporta
+    ON CONFLICT directamente.
+    """
+    columns = ', '.join(WEATHER_COLUMNS)
+    # Las tablas temporales no escriben WAL (igual que una UNLOGGED) y son
+    # privadas de cada sesión, así que los workers en paralelo no colisionan
+    cursor.execute(f"""
+        CREATE TEMP TABLE stg_weather ON COMMIT DROP AS
+        SELECT {columns} FROM weather_data WITH NO DATA
+    """)
+    stream = CopyStream(rows)
+    try:
+        cursor.copy_expert(
+            f"COPY stg_weather ({columns}) FROM STDIN WITH (FORMAT text, NULL '\\N')",
+            stream
+        )
+    except psycopg2.Error:
+        if stream.error is not None:
+            raise stream.error
+        raise
+    cursor.execute(f"""
+        INSERT INTO weather_data ({columns})
+        SELECT {columns} FROM stg_weather
+        ON CONFLICT (location_id, date, data_type) DO NOTHING
+    """)
+    # La transacción puede cargar varios archivos: liberar el staging ya
+    cursor.execute("DROP TABLE stg_weather")
+
+
+def insert_weather_rows(cursor, rows, page_size=PAGE_SIZE):
+    """
+    Inserta filas con execute_values: un único INSERT ... VALUES multi-fila
+    por página en lugar de un INSERT por registro
+    """
+    columns = ', '.join(WEATHER_COLUMNS)
+    execute_values(cursor, f"""
+        INSERT INTO weather_data ({columns}) VALUES %s
+        ON CONFLICT (location_id, date, data_type) DO NOTHING
+    """, rows, page_size=page_size)
+
+
+def prepare_weather_insert(cursor):
+    """Prepara la sentencia ins_weather una única vez por conexión"""
+    cursor.execute(
+        "SELECT 1 FROM pg_prepared_statements WHERE name = 'ins_weather'"
+    )
+    if cursor.fetchone():
+        return
+    
+    columns = ', '.join(WEATHER_COLUMNS)
+    placeholders = ', '.join(f'${i}' for i in range(1, len(WEATHER_COLUMNS) + 1))
+    cursor.execute(f"""
+        PREPARE ins_weather (
+            integer, date, varchar, numeric, numeric, numeric, numeric,
+            numeric, numeric, numeric, numeric, numeric
+        ) AS
+        INSERT INTO weather_data ({columns}) VALUES ({placeholders})
+        ON CONFLICT (location_id, date, data_type) DO NOTHING
+    """)
+
+
+def execute_weather_rows(cursor, rows, page_size=PAGE_SIZE):
+    """
+    Inserta filas ejecutando la sentencia preparada ins_weather: PostgreSQL
+    reutiliza el plan en lugar de parsear y planificar cada INSERT
+    """
+    prepare_weather_insert(cursor)
+    placeholders = ', '.join(['%s'] * len(WEATHER_COLUMNS))
+    execute_batch(
+        cursor, f"EXECUTE ins_weather ({placeholders})", rows, page_size=page_size
+    )
+
+
+def insert_weather_data(conn, records, data_type, method=LOAD_METHOD):
+    """
+    Inserta registros de clima en la tabla weather_data mediante carga masiva
+    
+    No hace commit: la transacción la controla quien llama (ver load_file).
+    Los registros se consumen en streaming: en memoria solo hay una página
+    (execute_values/execute_batch) o un bloque de lectura de COPY.
     
     Args:
         conn: Conexión a PostgreSQL
-        records: Lista de diccionarios con datos de clima
+        records: Iterable de diccionarios con datos de clima
         data_type: 'historical' o 'forecast'
+        method: 'copy' (COPY + staging), 'values' (execute_values)
+            o 'prepared' (sentencia preparada)
     """
-    if not records:
-        log(f"⚠ No hay registros para insertar ({data_type})")
-        return
+    row_count = 0
+    
+    def counted(rows):
+        nonlocal row_count
+        for row in rows:
+            row_count += 1
+            yield row
     
     cursor = conn.cursor()
+    rows = counted(build_weather_rows(records, data_type))
     
-    # Preparar datos para inserción batch
-    insert_data = []
-    for record in records:
-        location_id = LOCATIONS.get(record['location'])
-        if not location_id:
-            log(f"⚠ Ubicación desconocida: {record['location']}")
-            continue
+    try:
+        if method == 'copy':
+            copy_weather_rows(cursor, rows)
+        elif method == 'values':
+            insert_weather_rows(cursor, rows)
+        elif method == 'prepared':
+            execute_weather_rows(cursor, rows)
+        else:
+            raise ValueError(f"Método de carga desconocido: {method}")
         
-        insert_data.append((
-            location_id,
-            record['date'],
-            data_type,
-            record.get('weather_code'),
-            record.get('temperature_2m_max'),
-            record.get('temperature_2m_min'),
-            record.get('daylight_duration'),
-            record.get('shortwave_radiation_sum'),
-            record.get('precipitation_sum'),
-            record.get('et0_fao_evapotranspiration'),
-            record.get('soil_moisture_0_to_100cm_mean'),  # Puede ser NULL
-            record.get('vapour_pressure_deficit_max')
-        ))
+        if row_count:
+            log(f"✓ {row_count} registros {data_type} insertados")
+        else:
+            log(f"⚠ No hay registros para insertar ({data_type})")
+    except psycopg2.Error as e:
+        log(f"✗ Error insertando datos {data_type}: {e}")
+        raise
+    finally:
+        cursor.close()
+
+
+def load_file(filename, data_type):
+    """
+    Carga un archivo JSONL en weather_data usando su propia conexión
+    
+    Se ejecuta en un proceso worker: los inserts de distintos archivos son
+    independientes y ON CONFLICT DO NOTHING los hace seguros en paralelo.
+    
+    Todo el archivo se carga en una única transacción con
+    synchronous_commit = off: el commit no espera el flush del WAL a disco.
+    Pensado solo para la carga inicial masiva; ante una caída del servidor
+    se pueden perder las últimas transacciones confirmadas (nunca se
+    corrompe la base), y basta con volver a ejecutar el loader.
+    
+    Args:
+        filename: Nombre del archivo dentro de DATA_PATH
+        data_type: 'historical' o 'forecast'
+    """
+    filepath = os.path.join(DATA_PATH, filename)
+    conn = connect_db()
     
-    # Inserción por lotes (más eficiente)
     try:
-        execute_batch(cursor, """
-            INSERT INTO weather_data (
-                location_id, date, data_type, weather_code,
-                temperature_2m_max, temperature_2m_min, daylight_duration,
-                shortwave_radiation_sum, precipitation_sum,
-                et0_fao_evapotranspiration, soil_moisture_0_to_100cm_mean,
-                vapour_pressure_deficit_max
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            ON CONFLICT (location_id, date, data_type) DO NOTHING
-        """, insert_data, page_size=500)
+        cursor = conn.cursor()
+        cursor.execute("SET LOCAL synchronous_commit = off")
+        cursor.close()
+        
+        log(f"Leyendo {filename}...")
+        insert_weather_data(conn, load_json_file(filepath), data_type)
         
         conn.commit()
-        log(f"✓ {len(insert_data)} registros {data_type} insertados")
-    except psycopg2.Error as e:
-        log(f"✗ Error insertando datos {data_type}: {e}")
+    except json.JSONDecodeError as e:
+        # Archivo inválido: se descarta completo y se sigue con los demás
+        log(f"✗ Error parseando JSON en {filepath}: {e}")
+        conn.rollback()
+    except Exception:
         conn.rollback()
         raise
     finally:
-        cursor.close()
+        conn.close()
 
 
 def verify_data(conn):
@@ -196,24 +502,19 @@ def verify_data(conn):
     cursor = conn.cursor()
     
     try:
-        # Contar ubicaciones
-        cursor.execute("SELECT COUNT(*) FROM locations")
-        location_count = cursor.fetchone()[0]
+        # Conteos en una sola consulta (un único recorrido de weather_data)
+        cursor.execute("""
+            SELECT 
+                (SELECT COUNT(*) FROM locations),
+                COUNT(*) FILTER (WHERE data_type = 'historical'),
+                COUNT(*) FILTER (WHERE data_type = 'forecast'),
+                COUNT(*)
+            FROM weather_data
+        """)
+        location_count, historical_count, forecast_count, total_count = cursor.fetchone()
         log(f"Ubicaciones: {location_count}")
-        
-        # Contar registros históricos
-        cursor.execute("SELECT COUNT(*) FROM weather_data WHERE data_type = 'historical'")
-        historical_count = cursor.fetchone()[0]
         log(f"Datos históricos: {historical_count}")
-        
-        # Contar pronósticos
-        cursor.execute("SELECT COUNT(*) FROM weather_data WHERE data_type = 'forecast'")
-        forecast_count = cursor.fetchone()[0]
         log(f"Pronósticos: {forecast_count}")
-        
-        # Total
-        cursor.execute("SELECT COUNT(*) FROM weather_data")
-        total_count = cursor.fetchone()[0]
         log(f"Total registros: {total_count}")
         
         # Rangos de fechas por ubicación
@@ -249,32 +550,39 @@ def main():
         # 2. Insertar ubicaciones
         insert_locations(conn)
         
-        # 3. Remover constraint temporalmente
-        drop_foreign_key(conn)
-        
-        # 4. Cargar datos históricos
-        log("\n--- Cargando datos históricos ---")
-        for location in ['iowa_center', 'illinois_center']:
-            filename = f"historical_{location}_2025-09-27.json"
-            filepath = os.path.join(DATA_PATH, filename)
-            log(f"Leyendo {filename}...")
-            records = load_json_file(filepath)
-            log(f"  {len(records)} registros encontrados")
-            insert_weather_data(conn, records, 'historical')
-        
-        # 5. Cargar pronósticos
-        log("\n--- Cargando pronósticos ---")
-        for location in ['iowa_center', 'illinois_center']:
-            filename = f"forecast_{location}_20250929.json"
-            filepath = os.path.join(DATA_PATH, filename)
-            log(f"Leyendo {filename}...")
-            records = load_json_file(filepath)
-            log(f"  {len(records)} registros encontrados")
-            insert_weather_data(conn, records, 'forecast')
+        try:
+            # 3. Remover constraint e índices secundarios temporalmente
+            drop_foreign_key(conn)
+            drop_secondary_indexes(conn)
+            
+            # 4. Cargar históricos y pronósticos en paralelo (un archivo por proceso)
+            log("\n--- Cargando datos históricos y pronósticos ---")
+            jobs = [
+                (f"historical_{location}_2025-09-27.json", 'historical')
+                for location in ['iowa_center', 'illinois_center']
+            ] + [
+                (f"forecast_{location}_20250929.json", 'forecast')
+                for location in ['iowa_center', 'illinois_center']
+            ]
+            
+            with ProcessPoolExecutor(max_workers=min(MAX_WORKERS, len(jobs))) as executor:
+                futures = [
+                    executor.submit(load_file, filename, data_type)
+                    for filename, data_type in jobs
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            # 5. Recrear constraint e índices, también si la carga falló:
+            #    la tabla no debe quedar sin índices ni FK
+            log("")
+            try:
+                recreate_foreign_key(conn)
+            finally:
+                recreate_secondary_indexes(conn)
         
-        # 6. Recrear constraint
-        log("")
-        recreate_foreign_key(conn)
+        # 6. Refrescar agregados mensuales para el reporter
+        refresh_monthly_view(conn)
         
         # 7. Verificar datos
         verify_data(conn)
@@ -16,6 +16,10 @@ DB_CONFIG = {
     'password': 'weather_pass'
 }
 
+# Abreviaturas de meses indexadas por número de mes (1-12)
+MESES = ['', 'Ene', 'Feb', 'Mar', 'Abr', 'May', 'Jun',
+         'Jul', 'Ago', 'Sep', 'Oct', 'Nov', 'Dic']
+
 
 def print_header(title):
     """Imprime un encabezado formateado para el reporte"""
@@ -40,28 +44,64 @@ def connect_db():
         sys.exit(1)
 
 
-def query_1_temperature_averages(cursor):
-    """
-    Consulta 1: Promedio de temperaturas por ubicación
-    Valor de negocio: Identificar diferencias climáticas entre regiones
+def query_historical_summary(cursor):
     """
-    print_header("CONSULTA 1: Promedio de Temperaturas por Ubicación")
+    Consulta única sobre los datos históricos que alimenta las consultas 1, 2 y 3
+    
+    Calcula en una sola pasada (y un solo roundtrip) los promedios de
+    temperatura, los días con lluvia y las temperaturas extremas con sus fechas.
     
+    Returns:
+        list: Una fila por ubicación, ordenadas por nombre
+    """
     query = """
         SELECT 
-            l.location_name,
-            ROUND(AVG(w.temperature_2m_max)::numeric, 2) as temp_max_promedio,
-            ROUND(AVG(w.temperature_2m_min)::numeric, 2) as temp_min_promedio,
-            ROUND((AVG(w.temperature_2m_max) + AVG(w.temperature_2m_min)) / 2::numeric, 2) as temp_promedio
-        FROM weather_data w
-        JOIN locations l ON w.location_id = l.id
-        WHERE w.data_type = 'historical'
-        GROUP BY l.location_name
-        ORDER BY l.location_name
+            location_name,
+            ROUND(AVG(temperature_2m_max)::numeric, 2) as temp_max_promedio,
+            ROUND(AVG(temperature_2m_min)::numeric, 2) as temp_min_promedio,
+            ROUND((AVG(temperature_2m_max) + AVG(temperature_2m_min)) / 2::numeric, 2) as temp_promedio,
+            COUNT(*) as total_dias,
+            SUM(CASE WHEN precipitation_sum > 0 THEN 1 ELSE 0 END) as dias_con_lluvia,
+            ROUND((SUM(CASE WHEN precipitation_sum > 0 THEN 1 ELSE 0 END)::numeric / COUNT(*) * 100), 2) as porcentaje_lluvia,
+            ROUND(AVG(precipitation_sum)::numeric, 2) as precipitacion_promedio,
+            MAX(temperature_2m_max) as temp_max_absoluta,
+            MAX(fecha_max) as fecha_max,
+            MIN(temperature_2m_min) as temp_min_absoluta,
+            MAX(fecha_min) as fecha_min
+        FROM (
+            SELECT 
+                l.location_name,
+                w.temperature_2m_max,
+                w.temperature_2m_min,
+                w.precipitation_sum,
+                FIRST_VALUE(w.date) OVER (
+                    PARTITION BY w.location_id
+                    ORDER BY w.temperature_2m_max DESC NULLS LAST, w.date
+                ) as fecha_max,
+                FIRST_VALUE(w.date) OVER (
+                    PARTITION BY w.location_id
+                    ORDER BY w.temperature_2m_min ASC NULLS LAST, w.date
+                ) as fecha_min
+            FROM weather_data w
+            JOIN locations l ON w.location_id = l.id
+            WHERE w.data_type = 'historical'
+        ) historicos
+        GROUP BY location_name
+        ORDER BY location_name
     """
     
     cursor.execute(query)
-    results = cursor.fetchall()
+    return cursor.fetchall()
+
+
+def query_1_temperature_averages(summary):
+    """
+    Consulta 1: Promedio de temperaturas por ubicación
+    Valor de negocio: Identificar diferencias climáticas entre regiones
+    """
+    print_header("CONSULTA 1: Promedio de Temperaturas por Ubicación")
+    
+    results = [(row[0], row[1], row[2], row[3]) for row in summary]
     
     print("📊 Análisis de temperaturas históricas (2020-2025)\n")
     print(f"{'Ubicación':<20} {'Temp. Máx. Prom.':<20} {'Temp. Mín. Prom.':<20} {'Temp. Promedio':<20}")
@@ -73,29 +113,19 @@ def query_1_temperature_averages(cursor):
     print("\n💡 Insight: Útil para planificar cultivos según rangos térmicos de cada región.\n")
 
 
-def query_2_rainy_days(cursor):
+def query_2_rainy_days(summary):
     """
     Consulta 2: Días con precipitación por ubicación
     Valor de negocio: Evaluar riesgo de inundaciones y necesidades de drenaje
     """
     print_header("CONSULTA 2: Análisis de Días con Precipitación")
     
-    query = """
-        SELECT 
-            l.location_name,
-            COUNT(*) as total_dias,
-            SUM(CASE WHEN w.precipitation_sum > 0 THEN 1 ELSE 0 END) as dias_con_lluvia,
-            ROUND((SUM(CASE WHEN w.precipitation_sum > 0 THEN 1 ELSE 0 END)::numeric / COUNT(*) * 100), 2) as porcentaje_lluvia,
-            ROUND(AVG(w.precipitation_sum)::numeric, 2) as precipitacion_promedio
-        FROM weather_data w
-        JOIN locations l ON w.location_id = l.id
-        WHERE w.data_type = 'historical'
-        GROUP BY l.location_name
-        ORDER BY dias_con_lluvia DESC
-    """
-    
-    cursor.execute(query)
-    results = cursor.fetchall()
+    # Ordenado por días con lluvia (descendente)
+    results = sorted(
+        ((row[0], row[4], row[5], row[6], row[7]) for row in summary),
+        key=lambda row: row[2],
+        reverse=True
+    )
     
     print("🌧️ Frecuencia de precipitaciones (2020-2025)\n")
     print(f"{'Ubicación':<20} {'Total Días':<15} {'Días Lluvia':<15} {'% Lluvia':<15} {'Prom. (mm)':<15}")
@@ -107,35 +137,14 @@ def query_2_rainy_days(cursor):
     print("\n💡 Insight: Mayor frecuencia de lluvia indica necesidad de sistemas de drenaje.\n")
 
 
-def query_3_extreme_temperatures(cursor):
+def query_3_extreme_temperatures(summary):
     """
     Consulta 3: Temperaturas extremas registradas
     Valor de negocio: Identificar riesgos climáticos extremos
     """
     print_header("CONSULTA 3: Temperaturas Extremas Registradas")
     
-    query = """
-        SELECT 
-            l.location_name,
-            MAX(w.temperature_2m_max) as temp_max_absoluta,
-            (SELECT date::date FROM weather_data w2 
-             WHERE w2.location_id = w.location_id 
-             AND w2.temperature_2m_max = MAX(w.temperature_2m_max) 
-             LIMIT 1) as fecha_max,
-            MIN(w.temperature_2m_min) as temp_min_absoluta,
-            (SELECT date::date FROM weather_data w3 
-             WHERE w3.location_id = w.location_id 
-             AND w3.temperature_2m_min = MIN(w.temperature_2m_min) 
-             LIMIT 1) as fecha_min
-        FROM weather_data w
-        JOIN locations l ON w.location_id = l.id
-        WHERE w.data_type = 'historical'
-        GROUP BY l.location_name, w.location_id
-        ORDER BY l.location_name
-    """
-    
-    cursor.execute(query)
-    results = cursor.fetchall()
+    results = [(row[0], row[8], row[9], row[10], row[11]) for row in summary]
     
     print("🌡️ Temperaturas máximas y mínimas absolutas\n")
     print(f"{'Ubicación':<20} {'Máx. Absoluta':<25} {'Mín. Absoluta':<25}")
@@ -154,26 +163,23 @@ def query_4_monthly_precipitation_2024(cursor):
     """
     print_header("CONSULTA 4: Precipitación Mensual Promedio - Año 2024")
     
+    # Lee el agregado mensual precalculado por el loader (mv_weather_monthly)
     query = """
         SELECT 
             l.location_name,
-            EXTRACT(MONTH FROM w.date) as mes,
-            ROUND(AVG(w.precipitation_sum)::numeric, 2) as precipitacion_promedio,
-            COUNT(*) as dias_registrados
-        FROM weather_data w
-        JOIN locations l ON w.location_id = l.id
-        WHERE w.data_type = 'historical'
-        AND EXTRACT(YEAR FROM w.date) = 2024
-        GROUP BY l.location_name, EXTRACT(MONTH FROM w.date)
+            EXTRACT(MONTH FROM m.month) as mes,
+            ROUND(m.precip_avg::numeric, 2) as precipitacion_promedio,
+            m.days as dias_registrados
+        FROM mv_weather_monthly m
+        JOIN locations l ON m.location_id = l.id
+        WHERE m.month >= DATE '2024-01-01'
+        AND m.month < DATE '2025-01-01'
         ORDER BY l.location_name, mes
     """
     
     cursor.execute(query)
     results = cursor.fetchall()
     
-    meses = {1: 'Ene', 2: 'Feb', 3: 'Mar', 4: 'Abr', 5: 'May', 6: 'Jun',
-             7: 'Jul', 8: 'Ago', 9: 'Sep', 10: 'Oct', 11: 'Nov', 12: 'Dic'}
-    
     print("📅 Promedio de precipitaciones por mes en 2024\n")
     
     current_location = None
@@ -186,7 +192,7 @@ def query_4_monthly_precipitation_2024(cursor):
             print(f"  {'Mes':<10} {'Precipitación (mm)':<20} {'Días':<10}")
             print("  " + "-" * 40)
         
-        mes_nombre = meses.get(int(row[1]), str(row[1]))
+        mes_nombre = MESES[int(row[1])]
         print(f"  {mes_nombre:<10} {row[2]:>17} {row[3]:>10}")
     
     print("\n💡 Insight: Identificar meses más lluviosos para timing de siembra/cosecha.\n")
@@ -266,9 +272,10 @@ def main():
     
     try:
         # Ejecutar todas las consultas
-        query_1_temperature_averages(cursor)
-        query_2_rainy_days(cursor)
-        query_3_extreme_temperatures(cursor)
+        summary = query_historical_summary(cursor)
+        query_1_temperature_averages(summary)
+        query_2_rainy_days(summary)
+        query_3_extreme_temperatures(summary)
         query_4_monthly_precipitation_2024(cursor)
         query_5_forecast_comparison(cursor)
         
@@ -92,6 +92,29 @@ CREATE INDEX idx_weather_location_type ON weather_data(location_id, data_type);
 -- Índice compuesto para consultas de rango de fechas por ubicación
 CREATE INDEX idx_weather_location_date ON weather_data(location_id, date);
 
+-- Índice de cobertura para el reporter: todas sus consultas filtran por
+-- data_type y agrupan por ubicación; INCLUDE permite index-only scans
+CREATE INDEX idx_weather_type_loc_date ON weather_data(data_type, location_id, date)
+INCLUDE (temperature_2m_max, temperature_2m_min, precipitation_sum);
+
+-- =============================================================================
+-- Vista materializada: mv_weather_monthly
+-- Descripción: Agregado mensual de datos históricos para el reporter.
+-- Se refresca al final de cada carga (load_data.py); el índice único es
+-- requerido por REFRESH MATERIALIZED VIEW CONCURRENTLY.
+-- =============================================================================
+CREATE MATERIALIZED VIEW mv_weather_monthly AS
+SELECT 
+    location_id,
+    date_trunc('month', date)::date AS month,
+    AVG(precipitation_sum) AS precip_avg,
+    COUNT(*) AS days
+FROM weather_data
+WHERE data_type = 'historical'
+GROUP BY 1, 2;
+
+CREATE UNIQUE INDEX idx_mv_weather_monthly ON mv_weather_monthly(location_id, month);
+
 -- =============================================================================
 -- Verificación de la estructura creada
 -- =============================================================================
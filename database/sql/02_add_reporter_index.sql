@@ -0,0 +1,17 @@
+-- =============================================================================
+-- Migración: Índice de cobertura para el reporter
+-- ITBA - Cloud Data Engineering - Ejercicio 5
+-- =============================================================================
+-- Agrega idx_weather_type_loc_date a una base ya creada con una versión
+-- anterior de 01_create_tables.sql (que ya lo incluye). Es idempotente.
+--
+-- Ejecutar una única vez:
+--   Get-Content .\database\sql\02_add_reporter_index.sql | docker exec -i weather_postgres psql -U weather_user -d weather_db
+-- =============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_weather_type_loc_date
+ON weather_data(data_type, location_id, date)
+INCLUDE (temperature_2m_max, temperature_2m_min, precipitation_sum);
+
+-- Actualizar estadísticas para que el planner considere el nuevo índice
+ANALYZE weather_data;
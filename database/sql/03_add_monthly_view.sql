@@ -0,0 +1,23 @@
+-- =============================================================================
+-- Migración: Vista materializada mensual para el reporter
+-- ITBA - Cloud Data Engineering - Ejercicio 5
+-- =============================================================================
+-- Agrega mv_weather_monthly a una base ya creada con una versión anterior
+-- de 01_create_tables.sql (que ya la incluye). Es idempotente.
+--
+-- Ejecutar una única vez:
+--   Get-Content .\database\sql\03_add_monthly_view.sql | docker exec -i weather_postgres psql -U weather_user -d weather_db
+-- =============================================================================
+
+CREATE MATERIALIZED VIEW IF NOT EXISTS mv_weather_monthly AS
+SELECT 
+    location_id,
+    date_trunc('month', date)::date AS month,
+    AVG(precipitation_sum) AS precip_avg,
+    COUNT(*) AS days
+FROM weather_data
+WHERE data_type = 'historical'
+GROUP BY 1, 2;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_weather_monthly
+ON mv_weather_monthly(location_id, month);
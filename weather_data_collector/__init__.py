@@ -9,9 +9,20 @@ __version__ = "0.1.0"
 __author__ = "Neptali Saldarriaga"
 __description__ = "Collector de datos meteorológicos desde API Open Meteo"
 
-# Importar las clases/funciones principales que queremos exponer
-from .api_client import WeatherAPIClient
-from .config import WeatherConfig
+# Clases principales que exponemos, importadas recién al primer acceso
+# (PEP 562): así `weather_data_collector.utils` no arrastra el cliente de API
+_LAZY_EXPORTS = {
+    "WeatherAPIClient": ".api_client",
+    "WeatherConfig": ".config",
+}
+
+def __getattr__(name):
+    if name in _LAZY_EXPORTS:
+        from importlib import import_module
+        value = getattr(import_module(_LAZY_EXPORTS[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 # Definir qué se exporta cuando alguien hace "from weather_data_collector import *"
 __all__ = [
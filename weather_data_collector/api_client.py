@@ -5,9 +5,15 @@ Maneja las llamadas a las APIs de OpenMeteo para obtener datos históricos
 y de pronóstico meteorológico.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Callable
+from urllib.parse import urlparse
+import numpy as np
 import pandas as pd
+import niquests
 import openmeteo_requests
 import requests_cache
 from retry_requests import retry
@@ -34,22 +40,85 @@ class WeatherAPIClient:
             config: Configuración a usar. Si no se proporciona, usa la por defecto.
         """
         self.config = config or WeatherConfig()
+        
+        # Única validación de coordenadas en runtime: con `python -O`,
+        # Location.__post_init__ no valida y los requests ya no lo hacen
+        self.config.validate_locations(self.config.LOCATIONS)
+        
         self._setup_session()
+        
+        # Plantillas de parámetros: lo que no depende de la ubicación se arma
+        # una sola vez y cada request solo agrega las coordenadas
+        daily = tuple(self.config.DAILY_VARIABLES)
+        self._historical_template = {
+            "start_date": self.config.HISTORICAL_START_DATE,
+            "end_date": self.config.HISTORICAL_END_DATE,
+            "daily": daily,
+            "timezone": self.config.TIMEZONE,
+        }
+        self._forecast_template = {
+            "daily": daily,
+            "timezone": self.config.TIMEZONE,
+        }
+        
+        # Variables con su dtype, en el orden en que las devuelve la API
+        self._daily_dtypes = [
+            (var, self.config.DAILY_DTYPES.get(var, np.float32)) for var in daily
+        ]
+        
+        # Nombres de ubicaciones configuradas (categorías de la columna location)
+        self._location_names = [loc.name for loc in self.config.LOCATIONS]
+        self._location_codes = {
+            name: code for code, name in enumerate(self._location_names)
+        }
+        
+        # Índices de fechas por (inicio, fin, intervalo): todas las ubicaciones
+        # de un mismo request comparten el rango. DatetimeIndex es inmutable.
+        self._date_cache: Dict[tuple[int, int, int], pd.DatetimeIndex] = {}
     
     def _setup_session(self) -> None:
-        """Configura la sesión con cache y reintentos."""
+        """
+        Configura la cache compartida y la sesión con reintentos.
+        
+        requests.Session no es thread-safe (pool de conexiones, cookies), así
+        que cada thread de _fetch_all_locations usa su propia sesión (ver
+        _get_openmeteo). Todas comparten el mismo backend SQLite de
+        requests-cache, que sí lo es: serializa escrituras con un lock y usa
+        una conexión por thread.
+        """
         logger.info("⚙️ Configurando sesión con cache y reintentos")
         
+        self._cache_backend = requests_cache.SQLiteCache('.cache')
+        self._thread_local = threading.local()
+        self.openmeteo = self._get_openmeteo()
+    
+    def _create_openmeteo_client(self) -> openmeteo_requests.Client:
+        """Crea un cliente OpenMeteo con sesión cacheada y reintentos."""
+        # Los datos históricos de fechas fijas no cambian: se cachean sin
+        # expiración. Solo el pronóstico necesita refrescarse.
         cache_session = requests_cache.CachedSession(
-            '.cache', 
-            expire_after=3600
+            backend=self._cache_backend,
+            expire_after=requests_cache.NEVER_EXPIRE,
+            urls_expire_after={
+                urlparse(self.config.ARCHIVE_URL).netloc: requests_cache.NEVER_EXPIRE,
+                urlparse(self.config.FORECAST_URL).netloc: self.config.FORECAST_CACHE_EXPIRE,
+            },
+            allowable_codes=[200],
+            stale_if_error=True
         )
         retry_session = retry(
             cache_session, 
             retries=self.config.MAX_RETRIES, 
             backoff_factor=0.3
         )
-        self.openmeteo = openmeteo_requests.Client(session=retry_session)
+        return openmeteo_requests.Client(session=retry_session)
+    
+    def _get_openmeteo(self) -> openmeteo_requests.Client:
+        """Cliente OpenMeteo del thread actual (se crea en su primer uso)."""
+        client = getattr(self._thread_local, "openmeteo", None)
+        if client is None:
+            client = self._thread_local.openmeteo = self._create_openmeteo_client()
+        return client
     
     def fetch_historical_data(self, location: Location) -> pd.DataFrame:
         """
@@ -61,15 +130,12 @@ class WeatherAPIClient:
         Returns:
             pd.DataFrame: Datos meteorológicos históricos
         """
-        logger.info(f"📈 Obteniendo datos históricos para {location.name}")
+        logger.info("📈 Obteniendo datos históricos para %s", location.name)
         
         params = {
+            **self._historical_template,
             "latitude": location.lat,
             "longitude": location.lon,
-            "start_date": self.config.HISTORICAL_START_DATE,
-            "end_date": self.config.HISTORICAL_END_DATE,
-            "daily": self.config.DAILY_VARIABLES,
-            "timezone": self.config.TIMEZONE,
         }
         
         return self._fetch_data(
@@ -93,13 +159,12 @@ class WeatherAPIClient:
         Returns:
             pd.DataFrame: Datos meteorológicos de pronóstico
         """
-        logger.info(f"🔮 Obteniendo pronóstico para {location.name}")
+        logger.info("🔮 Obteniendo pronóstico para %s", location.name)
         
         params = {
+            **self._forecast_template,
             "latitude": location.lat,
             "longitude": location.lon,
-            "daily": self.config.DAILY_VARIABLES,
-            "timezone": self.config.TIMEZONE,
             "past_days": past_days,
             "forecast_days": forecast_days,
         }
@@ -126,12 +191,13 @@ class WeatherAPIClient:
             pd.DataFrame: Datos meteorológicos
         """
         try:
-            # Validar parámetros
-            self._validate_params(params)
+            # Validar parámetros (las plantillas ya los garantizan; solo en debug)
+            if __debug__:
+                self._validate_params(params)
             
             # Hacer request
-            logger.info(f"🌐 Consultando API para datos {data_type}")
-            responses = self.openmeteo.weather_api(url, params=params)
+            logger.info("🌐 Consultando API para datos %s", data_type)
+            responses = self._get_openmeteo().weather_api(url, params=params)
             
             if not responses:
                 raise ValueError("La API no devolvió datos")
@@ -143,15 +209,15 @@ class WeatherAPIClient:
             return self._process_response(response, location)
             
         except requests_cache.requests.exceptions.RequestException as e:
-            logger.error(f"❌ Error de conexión: {e}")
+            logger.error("❌ Error de conexión: %s", e)
             return pd.DataFrame()
             
         except ValueError as e:
-            logger.error(f"❌ Error de validación: {e}")
+            logger.error("❌ Error de validación: %s", e)
             return pd.DataFrame()
             
         except Exception as e:
-            logger.error(f"❌ Error inesperado para {location.name}: {e}")
+            logger.error("❌ Error inesperado para %s: %s", location.name, e)
             return pd.DataFrame()
     
     def _validate_params(self, params: Dict[str, Any]) -> None:
@@ -170,12 +236,8 @@ class WeatherAPIClient:
             if param not in params:
                 raise ValueError(f"Parámetro requerido faltante: {param}")
         
-        # Validar coordenadas
-        if not -90 <= params['latitude'] <= 90:
-            raise ValueError(f"Latitud inválida: {params['latitude']}")
-        
-        if not -180 <= params['longitude'] <= 180:
-            raise ValueError(f"Longitud inválida: {params['longitude']}")
+        # Las coordenadas ya vienen validadas por Location /
+        # WeatherConfig.validate_locations
     
     def _process_response(self, response, location: Location) -> pd.DataFrame:
         """
@@ -192,28 +254,82 @@ class WeatherAPIClient:
         
         daily = response.Daily()
         
-        # Crear índice de fechas
-        dates = pd.date_range(
-            start=pd.to_datetime(daily.Time(), unit="s", utc=True),
-            end=pd.to_datetime(daily.TimeEnd(), unit="s", utc=True),
-            freq=pd.Timedelta(seconds=daily.Interval()),
-            inclusive="left"
-        )
+        # Crear índice de fechas (compartido entre ubicaciones con el mismo rango)
+        key = (daily.Time(), daily.TimeEnd(), daily.Interval())
+        dates = self._date_cache.get(key)
+        if dates is None:
+            dates = self._date_cache.setdefault(key, pd.date_range(
+                start=pd.to_datetime(key[0], unit="s", utc=True),
+                end=pd.to_datetime(key[1], unit="s", utc=True),
+                freq=pd.Timedelta(seconds=key[2]),
+                inclusive="left"
+            ))
         
-        # Construir diccionario de datos
+        # Construir diccionario de datos columna a columna: arrays 1-D
+        # contiguos y de dtype uniforme para que pandas no tenga que copiar
         daily_data = {"date": dates}
         
-        for i, var in enumerate(self.config.DAILY_VARIABLES):
-            daily_data[var] = daily.Variables(i).ValuesAsNumpy()
+        for i, (var, dtype) in enumerate(self._daily_dtypes):
+            daily_data[var] = np.ascontiguousarray(
+                daily.Variables(i).ValuesAsNumpy(), dtype=dtype
+            )
         
-        # Crear DataFrame
-        df = pd.DataFrame(daily_data)
-        df["location"] = location.name
+        # Crear DataFrame sin copiar los arrays
+        df = pd.DataFrame(daily_data, copy=False)
         
-        logger.info(f"✅ Procesados {len(df)} registros para {location.name}")
+        # Categorías comunes a todas las ubicaciones: concatenar DataFrames de
+        # distintas ubicaciones conserva el dtype sin recodificar strings
+        code = self._location_codes.get(location.name)
+        if code is None:
+            df["location"] = pd.Categorical([location.name] * len(df))
+        else:
+            df["location"] = pd.Categorical.from_codes(
+                np.full(len(df), code, dtype=np.int16),
+                categories=self._location_names
+            )
+        
+        logger.info("✅ Procesados %s registros para %s", len(df), location.name)
         
         return df
     
+    def _fetch_all_locations(self, 
+                             fetch: Callable[[Location], pd.DataFrame],
+                             empty_message: str) -> Dict[str, pd.DataFrame]:
+        """
+        Ejecuta una función de fetch para todas las ubicaciones en paralelo.
+        
+        Cada request es I/O de red (libera el GIL), así que con un thread por
+        ubicación el tiempo total es ~el del request más lento en lugar de
+        la suma de todos.
+        
+        Args:
+            fetch: Función que obtiene el DataFrame de una ubicación
+            empty_message: Mensaje de warning si no hay datos para una ubicación
+            
+        Returns:
+            Dict[str, pd.DataFrame]: Diccionario con datos por ubicación
+        """
+        locations = self.config.LOCATIONS
+        max_workers = max(1, min(self.config.MAX_WORKERS, len(locations)))
+        
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                (location, executor.submit(fetch, location))
+                for location in locations
+            ]
+            
+            # Recolectar en el orden de configuración
+            for location, future in futures:
+                df = future.result()
+                if not df.empty:
+                    results[location.name] = df
+                else:
+                    logger.warning("%s %s", empty_message, location.name)
+        
+        return results
+    
     def fetch_all_locations_historical(self) -> Dict[str, pd.DataFrame]:
         """
         Obtiene datos históricos para todas las ubicaciones configuradas.
@@ -223,16 +339,12 @@ class WeatherAPIClient:
         """
         logger.info("🌍 Obteniendo datos históricos para todas las ubicaciones")
         
-        results = {}
-        
-        for location in self.config.LOCATIONS:
-            df = self.fetch_historical_data(location)
-            if not df.empty:
-                results[location.name] = df
-            else:
-                logger.warning(f"⚠️ No se obtuvieron datos para {location.name}")
+        results = self._fetch_all_locations(
+            self.fetch_historical_data,
+            "⚠️ No se obtuvieron datos para"
+        )
         
-        logger.info(f"✅ Completado: {len(results)} ubicaciones procesadas")
+        logger.info("✅ Completado: %s ubicaciones procesadas", len(results))
         return results
     
     def fetch_all_locations_forecast(self) -> Dict[str, pd.DataFrame]:
@@ -244,16 +356,150 @@ class WeatherAPIClient:
         """
         logger.info("🌍 Obteniendo pronósticos para todas las ubicaciones")
         
-        results = {}
+        results = self._fetch_all_locations(
+            self.fetch_forecast_data,
+            "⚠️ No se obtuvo pronóstico para"
+        )
+        
+        logger.info("✅ Completado: %s pronósticos procesados", len(results))
+        return results
+
+    async def _fetch_data_async(self, client, semaphore: asyncio.Semaphore,
+                                url: str, params: Dict[str, Any],
+                                location: Location, data_type: str) -> pd.DataFrame:
+        """
+        Versión asíncrona de _fetch_data.
         
-        for location in self.config.LOCATIONS:
-            df = self.fetch_forecast_data(location)
+        Args:
+            client: openmeteo_requests.AsyncClient compartido
+            semaphore: Semáforo que limita los requests en vuelo
+            url: URL del endpoint
+            params: Parámetros de la consulta
+            location: Ubicación para la cual obtener datos
+            data_type: Tipo de datos (para logging)
+            
+        Returns:
+            pd.DataFrame: Datos meteorológicos
+        """
+        try:
+            if __debug__:
+                self._validate_params(params)
+            
+            async with semaphore:
+                logger.info("🌐 Consultando API para datos %s (%s)", data_type, location.name)
+                responses = await client.weather_api(url, params=params)
+            
+            if not responses:
+                raise ValueError("La API no devolvió datos")
+            
+            return self._process_response(responses[0], location)
+            
+        except ValueError as e:
+            logger.error("❌ Error de validación: %s", e)
+            return pd.DataFrame()
+            
+        except Exception as e:
+            logger.error("❌ Error inesperado para %s: %s", location.name, e)
+            return pd.DataFrame()
+    
+    async def _fetch_all_locations_async(self, url: str, template: Dict[str, Any],
+                                         data_type: str,
+                                         empty_message: str) -> Dict[str, pd.DataFrame]:
+        """
+        Obtiene datos para todas las ubicaciones con corrutinas en lugar de threads.
+        
+        Todas las ubicaciones se lanzan a la vez con asyncio.gather; el
+        semáforo limita cuántos requests quedan en vuelo contra OpenMeteo.
+        Este modo no usa el cache de requests-cache (que es síncrono).
+        
+        Args:
+            url: URL del endpoint
+            template: Plantilla de parámetros sin coordenadas
+            data_type: Tipo de datos (para logging)
+            empty_message: Mensaje de warning si no hay datos para una ubicación
+            
+        Returns:
+            Dict[str, pd.DataFrame]: Diccionario con datos por ubicación
+        """
+        locations = self.config.LOCATIONS
+        semaphore = asyncio.Semaphore(self.config.MAX_CONCURRENT_REQUESTS)
+        
+        # niquests negocia HTTP/2 por ALPN (conexiones persistentes con
+        # compresión de headers); el pool acompaña al límite de concurrencia
+        async with niquests.AsyncSession(
+            retries=self.config.MAX_RETRIES,
+            timeout=self.config.REQUEST_TIMEOUT,
+            pool_maxsize=self.config.MAX_CONCURRENT_REQUESTS
+        ) as session:
+            client = openmeteo_requests.AsyncClient(session=session)
+            frames = await asyncio.gather(*(
+                self._fetch_data_async(
+                    client, semaphore, url,
+                    {**template, "latitude": location.lat, "longitude": location.lon},
+                    location, data_type
+                )
+                for location in locations
+            ))
+        
+        results = {}
+        for location, df in zip(locations, frames):
             if not df.empty:
                 results[location.name] = df
             else:
-                logger.warning(f"⚠️ No se obtuvo pronóstico para {location.name}")
+                logger.warning("%s %s", empty_message, location.name)
+        
+        return results
+    
+    async def fetch_all_locations_historical_async(self) -> Dict[str, pd.DataFrame]:
+        """
+        Obtiene datos históricos para todas las ubicaciones de forma asíncrona.
+        
+        Pensado para configuraciones con muchas ubicaciones, donde un thread
+        por request deja de escalar.
+        
+        Returns:
+            Dict[str, pd.DataFrame]: Diccionario con datos por ubicación
+        """
+        logger.info("🌍 Obteniendo datos históricos para todas las ubicaciones (async)")
+        
+        results = await self._fetch_all_locations_async(
+            self.config.ARCHIVE_URL,
+            self._historical_template,
+            "históricos",
+            "⚠️ No se obtuvieron datos para"
+        )
+        
+        logger.info("✅ Completado: %s ubicaciones procesadas", len(results))
+        return results
+    
+    async def fetch_all_locations_forecast_async(self, 
+                                                 past_days: int = 1,
+                                                 forecast_days: int = 7) -> Dict[str, pd.DataFrame]:
+        """
+        Obtiene pronósticos para todas las ubicaciones de forma asíncrona.
+        
+        Args:
+            past_days: Días hacia atrás a incluir
+            forecast_days: Días de pronóstico hacia adelante
+            
+        Returns:
+            Dict[str, pd.DataFrame]: Diccionario con datos por ubicación
+        """
+        logger.info("🌍 Obteniendo pronósticos para todas las ubicaciones (async)")
+        
+        template = {
+            **self._forecast_template,
+            "past_days": past_days,
+            "forecast_days": forecast_days,
+        }
+        results = await self._fetch_all_locations_async(
+            self.config.FORECAST_URL,
+            template,
+            "pronóstico",
+            "⚠️ No se obtuvo pronóstico para"
+        )
         
-        logger.info(f"✅ Completado: {len(results)} pronósticos procesados")
+        logger.info("✅ Completado: %s pronósticos procesados", len(results))
         return results
 
 # Función de conveniencia para compatibilidad con código existente
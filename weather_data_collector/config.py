@@ -6,7 +6,8 @@ Define configuraciones para datos históricos (fijos) y actuales/forecast (diná
 
 from datetime import date, timedelta
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+import numpy as np
 
 @dataclass
 class Location:
@@ -16,11 +17,17 @@ class Location:
     lon: float
     
     def __post_init__(self):
-        """Valida que las coordenadas estén en rangos válidos."""
-        if not -90 <= self.lat <= 90:
-            raise ValueError(f"Latitud inválida: {self.lat}. Debe estar entre -90 y 90.")
-        if not -180 <= self.lon <= 180:
-            raise ValueError(f"Longitud inválida: {self.lon}. Debe estar entre -180 y 180.")
+        """
+        Valida que las coordenadas estén en rangos válidos.
+        
+        Solo en modo debug: con `python -O` la validación queda a cargo de
+        WeatherConfig.validate_locations, que revisa todas de una vez.
+        """
+        if __debug__:
+            if not -90 <= self.lat <= 90:
+                raise ValueError(f"Latitud inválida: {self.lat}. Debe estar entre -90 y 90.")
+            if not -180 <= self.lon <= 180:
+                raise ValueError(f"Longitud inválida: {self.lon}. Debe estar entre -180 y 180.")
 
 class WeatherConfig:
     """
@@ -64,7 +71,7 @@ class WeatherConfig:
     ]
     
     # Variables meteorológicas diarias
-    DAILY_VARIABLES = [
+    DAILY_VARIABLES = (
         "weather_code",                    # Código de clima
         "temperature_2m_max",              # Temperatura máxima a 2m
         "temperature_2m_min",              # Temperatura mínima a 2m  
@@ -74,7 +81,22 @@ class WeatherConfig:
         "et0_fao_evapotranspiration",     # Evapotranspiración FAO
         "soil_moisture_0_to_100cm_mean",  # Humedad del suelo 0-100cm
         "vapour_pressure_deficit_max",    # Déficit de presión de vapor máximo
-    ]
+    )
+    
+    # dtype mínimo por variable. weather_code y daylight_duration quedan en
+    # float32: la API devuelve NaN en días sin dato y daylight_duration trae
+    # fracciones de segundo, así que int16/int32 perderían información.
+    DAILY_DTYPES = {
+        "weather_code": "float32",
+        "temperature_2m_max": "float32",
+        "temperature_2m_min": "float32",
+        "daylight_duration": "float32",
+        "precipitation_sum": "float32",
+        "shortwave_radiation_sum": "float32",
+        "et0_fao_evapotranspiration": "float32",
+        "soil_moisture_0_to_100cm_mean": "float32",
+        "vapour_pressure_deficit_max": "float32",
+    }
     
     # URLs de las APIs de OpenMeteo
     TIMEZONE = "auto"
@@ -88,6 +110,9 @@ class WeatherConfig:
     REQUEST_TIMEOUT = 30
     MAX_RETRIES = 3
     RETRY_DELAY = 1
+    MAX_WORKERS = 8                    # Requests concurrentes (una por ubicación)
+    MAX_CONCURRENT_REQUESTS = 20       # Límite de requests en vuelo (modo async)
+    FORECAST_CACHE_EXPIRE = 1800       # Segundos; los históricos no expiran
     
     @classmethod
     def get_location_by_name(cls, name: str) -> Location:
@@ -97,6 +122,35 @@ class WeatherConfig:
                 return location
         raise ValueError(f"Ubicación '{name}' no encontrada")
     
+    @classmethod
+    def validate_locations(cls, locations: Optional[List[Location]] = None) -> bool:
+        """
+        Valida las coordenadas de todas las ubicaciones en una sola pasada.
+        
+        Args:
+            locations: Ubicaciones a validar. Si no se proporcionan, usa LOCATIONS.
+        """
+        if locations is None:
+            locations = cls.LOCATIONS
+        
+        lats = np.fromiter((loc.lat for loc in locations), dtype=np.float64,
+                           count=len(locations))
+        lons = np.fromiter((loc.lon for loc in locations), dtype=np.float64,
+                           count=len(locations))
+        
+        # Comparación negada para que NaN también se considere inválido
+        invalid_lat = ~(np.abs(lats) <= 90)
+        if invalid_lat.any():
+            location = locations[int(np.argmax(invalid_lat))]
+            raise ValueError(f"Latitud inválida: {location.lat}. Debe estar entre -90 y 90.")
+        
+        invalid_lon = ~(np.abs(lons) <= 180)
+        if invalid_lon.any():
+            location = locations[int(np.argmax(invalid_lon))]
+            raise ValueError(f"Longitud inválida: {location.lon}. Debe estar entre -180 y 180.")
+        
+        return True
+    
     @classmethod
     def validate_config(cls) -> bool:
         """Valida la configuración."""
@@ -109,6 +163,8 @@ class WeatherConfig:
         
         if not cls.LOCATIONS:
             raise ValueError("Debe haber al menos una ubicación configurada")
+        
+        cls.validate_locations()
             
         if not cls.DAILY_VARIABLES:
             raise ValueError("Debe haber al menos una variable meteorológica configurada")
@@ -7,8 +7,11 @@ todas las ubicaciones configuradas, con validación y manejo de errores.
 
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
+import numpy as np
 import pandas as pd
 
 # Imports del paquete weather_data_collector
@@ -47,7 +50,7 @@ class WeatherDataPipeline:
         
         logger.info("🚀 Pipeline inicializado")
     
-    def process_location_historical(self, location: Location) -> bool:
+    def process_location_historical(self, location: Location) -> tuple[bool, pd.DataFrame]:
         """
         Procesa datos históricos para una ubicación específica.
         
@@ -55,23 +58,24 @@ class WeatherDataPipeline:
             location: Ubicación a procesar
             
         Returns:
-            bool: True si se procesó correctamente
+            tuple[bool, pd.DataFrame]: (True si se procesó correctamente,
+            datos obtenidos para reutilizar sin volver a pedirlos)
         """
-        logger.info(f"📈 Procesando datos históricos para {location.name}")
+        logger.info("📈 Procesando datos históricos para %s", location.name)
         
         try:
             # Obtener datos
             df = self.api_client.fetch_historical_data(location)
             
             if df.empty:
-                logger.warning(f"⚠️ No se obtuvieron datos históricos para {location.name}")
-                return False
+                logger.warning("⚠️ No se obtuvieron datos históricos para %s", location.name)
+                return False, df
             
             # Validar calidad de datos
             quality_report = self.data_utils.validate_data_quality(df, location.name)
             if quality_report["status"] == "error":
-                logger.error(f"❌ Datos históricos inválidos para {location.name}")
-                return False
+                logger.error("❌ Datos históricos inválidos para %s", location.name)
+                return False, df
             
             # Guardar archivo
             filename = f"historical_{location.name}_{self.config.HISTORICAL_END_DATE}.json"
@@ -80,60 +84,63 @@ class WeatherDataPipeline:
             success = self.data_utils.save_to_json(df, output_path)
             
             if success:
-                logger.info(f"✅ Datos históricos guardados para {location.name}")
-                return True
+                logger.info("✅ Datos históricos guardados para %s", location.name)
+                return True, df
             else:
-                logger.error(f"❌ Error guardando datos históricos para {location.name}")
-                return False
+                logger.error("❌ Error guardando datos históricos para %s", location.name)
+                return False, df
                 
         except Exception as e:
-            logger.error(f"❌ Error procesando históricos para {location.name}: {e}")
-            return False
+            logger.error("❌ Error procesando históricos para %s: %s", location.name, e)
+            return False, pd.DataFrame()
     
-    def process_location_forecast(self, location: Location) -> bool:
+    def process_location_forecast(self, location: Location,
+                                  timestamp: Optional[str] = None) -> tuple[bool, pd.DataFrame]:
         """
         Procesa datos de pronóstico para una ubicación específica.
         
         Args:
             location: Ubicación a procesar
+            timestamp: Fecha de la corrida (YYYYMMDD) para el nombre de archivo.
+                Si no se proporciona, usa la fecha actual.
             
         Returns:
-            bool: True si se procesó correctamente
+            tuple[bool, pd.DataFrame]: (True si se procesó correctamente,
+            datos obtenidos para reutilizar sin volver a pedirlos)
         """
-        logger.info(f"🔮 Procesando pronóstico para {location.name}")
+        logger.info("🔮 Procesando pronóstico para %s", location.name)
         
         try:
             # Obtener datos
             df = self.api_client.fetch_forecast_data(location)
             
             if df.empty:
-                logger.warning(f"⚠️ No se obtuvo pronóstico para {location.name}")
-                return False
+                logger.warning("⚠️ No se obtuvo pronóstico para %s", location.name)
+                return False, df
             
             # Validar calidad de datos
             quality_report = self.data_utils.validate_data_quality(df, location.name)
             if quality_report["status"] == "error":
-                logger.error(f"❌ Datos de pronóstico inválidos para {location.name}")
-                return False
+                logger.error("❌ Datos de pronóstico inválidos para %s", location.name)
+                return False, df
             
             # Guardar archivo
-            from datetime import datetime
-            timestamp = datetime.now().strftime("%Y%m%d")
+            timestamp = timestamp or datetime.now().strftime("%Y%m%d")
             filename = f"forecast_{location.name}_{timestamp}.json"
             output_path = Path(self.config.OUTPUT_DIR) / filename
             
             success = self.data_utils.save_to_json(df, output_path)
             
             if success:
-                logger.info(f"✅ Pronóstico guardado para {location.name}")
-                return True
+                logger.info("✅ Pronóstico guardado para %s", location.name)
+                return True, df
             else:
-                logger.error(f"❌ Error guardando pronóstico para {location.name}")
-                return False
+                logger.error("❌ Error guardando pronóstico para %s", location.name)
+                return False, df
                 
         except Exception as e:
-            logger.error(f"❌ Error procesando pronóstico para {location.name}: {e}")
-            return False
+            logger.error("❌ Error procesando pronóstico para %s: %s", location.name, e)
+            return False, pd.DataFrame()
     
     def merge_datasets(self, location: Location, 
                       df_historical: pd.DataFrame, 
@@ -151,36 +158,89 @@ class WeatherDataPipeline:
         """
         try:
             if df_historical.empty or df_forecast.empty:
-                logger.warning(f"⚠️ No se puede combinar datos vacíos para {location.name}")
+                logger.warning("⚠️ No se puede combinar datos vacíos para %s", location.name)
                 return None
             
-            logger.info(f"🔄 Combinando datasets para {location.name}")
-            
-            # Asegurar que las fechas sean datetime
-            df_historical['date'] = pd.to_datetime(df_historical['date'])
-            df_forecast['date'] = pd.to_datetime(df_forecast['date'])
-            
-            # Combinar datos
-            df_combined = pd.concat([df_historical, df_forecast], ignore_index=True)
-            
-            # Eliminar duplicados (priorizando datos más recientes - forecast)
-            df_combined = df_combined.sort_values(['date', 'location'])
-            df_combined = df_combined.drop_duplicates(
-                subset=['date', 'location'], 
-                keep='last'  # Mantener el más reciente
-            )
-            
-            # Ordenar por fecha
-            df_combined = df_combined.sort_values('date').reset_index(drop=True)
+            logger.info("🔄 Combinando datasets para %s", location.name)
+            
+            # Asegurar que las fechas sean datetime (los DataFrames del cliente
+            # ya las traen así, en ese caso no se vuelve a parsear)
+            if not pd.api.types.is_datetime64_any_dtype(df_historical['date']):
+                df_historical['date'] = pd.to_datetime(df_historical['date'])
+            if not pd.api.types.is_datetime64_any_dtype(df_forecast['date']):
+                df_forecast['date'] = pd.to_datetime(df_forecast['date'])
+            
+            if (df_historical['date'].is_monotonic_increasing and 
+                    df_forecast['date'].is_monotonic_increasing):
+                # Ambos datasets vienen ordenados por fecha: se concatena
+                # antes/ventana del pronóstico/después, que ya queda ordenado.
+                # Dentro de la ventana solo se descartan los históricos cuya
+                # fecha trae el pronóstico (priorizando los datos más recientes
+                # - forecast); los días que le faltan se conservan
+                dates = df_historical['date']
+                forecast_dates = df_forecast['date']
+                first, last = forecast_dates.iloc[0], forecast_dates.iloc[-1]
+                
+                window = df_forecast
+                gaps = (dates >= first) & (dates <= last) & ~dates.isin(forecast_dates)
+                if gaps.any():
+                    window = pd.concat([df_historical[gaps], df_forecast])
+                    window = window.sort_values('date', kind='stable')
+                
+                parts = [df_historical[dates < first], window]
+                after = dates > last
+                if after.any():
+                    parts.append(df_historical[after])
+                
+                df_combined = pd.concat(parts, ignore_index=True)
+            else:
+                df_combined = self._merge_unsorted(df_historical, df_forecast)
             
-            logger.info(f"✅ Datasets combinados: {len(df_combined)} registros totales")
+            logger.info("✅ Datasets combinados: %s registros totales", len(df_combined))
             
             return df_combined
             
         except Exception as e:
-            logger.error(f"❌ Error combinando datasets para {location.name}: {e}")
+            logger.error("❌ Error combinando datasets para %s: %s", location.name, e)
             return None
     
+    @staticmethod
+    def _merge_unsorted(df_historical: pd.DataFrame, 
+                        df_forecast: pd.DataFrame) -> pd.DataFrame:
+        """
+        Combina datasets sin asumir orden, priorizando el pronóstico.
+        
+        Ordena con un lexsort estable sobre (location, date) en NumPy: el
+        forecast queda después del histórico dentro de cada clave, así que
+        alcanza con quedarse con el último registro de cada grupo.
+        
+        Args:
+            df_historical: Datos históricos
+            df_forecast: Datos de pronóstico
+            
+        Returns:
+            pd.DataFrame: Dataset combinado, ordenado por fecha
+        """
+        df_all = pd.concat([df_historical, df_forecast], ignore_index=True)
+        
+        dates = df_all['date'].values.view('i8')
+        codes = pd.factorize(df_all['location'])[0]
+        
+        order = np.lexsort((dates, codes))
+        dates_sorted = dates[order]
+        codes_sorted = codes[order]
+        
+        # Último registro de cada (location, date)
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = ((dates_sorted[1:] != dates_sorted[:-1]) | 
+                     (codes_sorted[1:] != codes_sorted[:-1]))
+        selected = order[last]
+        
+        # Ordenar por fecha
+        selected = selected[np.argsort(dates[selected], kind='stable')]
+        
+        return df_all.take(selected).reset_index(drop=True)
+    
     def run_pipeline(self, 
                 include_historical: bool = True,
                 include_forecast: bool = True,
@@ -214,54 +274,98 @@ class WeatherDataPipeline:
         
         results = {}
         
-        for location in locations_to_process:
-            logger.info(f"📍 Procesando ubicación: {location.name}")
-            
-            location_results = {
-                'historical': False,
-                'forecast': False,
-                'combined': False
-            }
-            
-            df_historical = pd.DataFrame()
-            df_forecast = pd.DataFrame()
-            
-            # Procesar datos históricos
-            if include_historical:
-                if self.process_location_historical(location):
-                    location_results['historical'] = True
-                    df_historical = self.api_client.fetch_historical_data(location)
-            
-            # Procesar datos de pronóstico
-            if include_forecast:
-                if self.process_location_forecast(location):
-                    location_results['forecast'] = True
-                    df_forecast = self.api_client.fetch_forecast_data(location)
-            
-            # Crear dataset combinado
-            if (create_combined and 
-                location_results['historical'] and 
-                location_results['forecast']):
-                
-                df_combined = self.merge_datasets(location, df_historical, df_forecast)
-                
-                if df_combined is not None:
-                    from datetime import datetime
-                    timestamp = datetime.now().strftime("%Y%m%d")
-                    filename = f"combined_{location.name}_{timestamp}.json"
-                    output_path = Path(self.config.OUTPUT_DIR) / filename
-                    
-                    if self.data_utils.save_to_json(df_combined, output_path):
-                        location_results['combined'] = True
-                        logger.info(f"✅ Dataset combinado creado para {location.name}")
-            
-            results[location.name] = location_results
+        # Una sola fecha para toda la corrida: todos los archivos llevan el
+        # mismo sufijo aunque la corrida cruce la medianoche
+        run_ts = datetime.now().strftime("%Y%m%d")
+        
+        # Lanzar históricos y pronósticos de todas las ubicaciones en paralelo:
+        # son requests de red independientes entre sí
+        tasks_per_location = int(include_historical) + int(include_forecast)
+        max_workers = max(1, min(
+            self.config.MAX_WORKERS,
+            len(locations_to_process) * tasks_per_location
+        ))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for location in locations_to_process:
+                if include_historical:
+                    futures[(location.name, 'historical')] = executor.submit(
+                        self.process_location_historical, location
+                    )
+                if include_forecast:
+                    futures[(location.name, 'forecast')] = executor.submit(
+                        self.process_location_forecast, location, run_ts
+                    )
+            
+            for location in locations_to_process:
+                results[location.name] = self._collect_location(
+                    location, futures, create_combined, run_ts
+                )
         
         # Reporte final
         self._print_final_report(results)
         
         return results
     
+    def _collect_location(self, location: Location, futures: dict,
+                          create_combined: bool, run_ts: str) -> dict[str, bool]:
+        """
+        Recolecta los resultados de una ubicación y crea el dataset combinado.
+        
+        Args:
+            location: Ubicación a recolectar
+            futures: Futures de procesamiento indexados por (ubicación, tipo)
+            create_combined: Si crear archivo combinado
+            run_ts: Fecha de la corrida (YYYYMMDD) para el nombre de archivo
+            
+        Returns:
+            dict: Éxito/fallo por proceso para la ubicación
+        """
+        logger.info("📍 Procesando ubicación: %s", location.name)
+        
+        location_results = {
+            'historical': False,
+            'forecast': False,
+            'combined': False
+        }
+        
+        df_historical = pd.DataFrame()
+        df_forecast = pd.DataFrame()
+        
+        # Resultado de datos históricos (se reutiliza el DataFrame ya obtenido)
+        future = futures.get((location.name, 'historical'))
+        if future is not None:
+            ok, df = future.result()
+            if ok:
+                location_results['historical'] = True
+                df_historical = df
+        
+        # Resultado de datos de pronóstico
+        future = futures.get((location.name, 'forecast'))
+        if future is not None:
+            ok, df = future.result()
+            if ok:
+                location_results['forecast'] = True
+                df_forecast = df
+        
+        # Crear dataset combinado
+        if (create_combined and 
+            location_results['historical'] and 
+            location_results['forecast']):
+            
+            df_combined = self.merge_datasets(location, df_historical, df_forecast)
+            
+            if df_combined is not None:
+                filename = f"combined_{location.name}_{run_ts}.json"
+                output_path = Path(self.config.OUTPUT_DIR) / filename
+                
+                if self.data_utils.save_to_json(df_combined, output_path):
+                    location_results['combined'] = True
+                    logger.info("✅ Dataset combinado creado para %s", location.name)
+        
+        return location_results
+    
     def _print_final_report(self, results: dict[str, dict[str, bool]]) -> None:
         """
         Imprime reporte final del pipeline.
@@ -269,31 +373,38 @@ class WeatherDataPipeline:
         Args:
             results: Resultados del pipeline por ubicación
         """
-        logger.info("\n" + "="*60)
-        logger.info("📊 REPORTE FINAL DEL PIPELINE")
-        logger.info("="*60)
+        if not logger.isEnabledFor(logging.INFO):
+            return
         
-        total_locations = len(results)
-        successful_locations = 0
+        names = list(results)
+        processes = list(results[names[0]]) if names else []
         
-        for location_name, location_results in results.items():
-            success_count = sum(location_results.values())
-            total_processes = len(location_results)
-            
-            if success_count > 0:
-                successful_locations += 1
-            
-            status = "✅" if success_count == total_processes else "⚠️" if success_count > 0 else "❌"
-            
-            logger.info(f"{status} {location_name}: {success_count}/{total_processes} procesos exitosos")
-            
-            for process, success in location_results.items():
-                icon = "✅" if success else "❌"
-                logger.info(f"   {icon} {process}")
+        # Matriz ubicaciones x procesos: los conteos salen en una sola operación
+        matrix = np.array(
+            [[results[name][process] for process in processes] for name in names],
+            dtype=bool
+        ).reshape(len(names), len(processes))
+        success_counts = matrix.sum(axis=1)
+        successful_locations = int((success_counts > 0).sum())
+        total_processes = len(processes)
+        
+        lines = ["\n" + "="*60, "📊 REPORTE FINAL DEL PIPELINE", "="*60]
+        
+        for name, row, success_count in zip(names, matrix, success_counts):
+            status = ("✅" if success_count == total_processes 
+                      else "⚠️" if success_count > 0 else "❌")
+            lines.append(f"{status} {name}: {success_count}/{total_processes} procesos exitosos")
+            lines.extend(
+                f"   {'✅' if success else '❌'} {process}"
+                for process, success in zip(processes, row)
+            )
+        
+        lines.append("-" * 60)
+        lines.append(f"🏁 Resumen: {successful_locations}/{len(names)} ubicaciones procesadas")
+        lines.append("="*60)
         
-        logger.info("-" * 60)
-        logger.info(f"🏁 Resumen: {successful_locations}/{total_locations} ubicaciones procesadas")
-        logger.info("="*60)
+        # Un solo registro de log con todo el reporte
+        logger.info("\n".join(lines))
 
 def main():
     """Función principal con argumentos de línea de comandos."""
@@ -360,7 +471,7 @@ def main():
         logger.info("⏹️ Pipeline interrumpido por el usuario")
         exit(1)
     except Exception as e:
-        logger.error(f"💥 Error crítico en el pipeline: {e}")
+        logger.error("💥 Error crítico en el pipeline: %s", e)
         exit(1)
 
 if __name__ == "__main__":
@@ -0,0 +1,113 @@
+"""
+Tests unitarios para el cliente de API.
+
+Valida la recolección en paralelo de ubicaciones sin hacer requests reales.
+"""
+
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import pandas as pd
+
+from weather_data_collector.api_client import WeatherAPIClient
+from weather_data_collector.config import WeatherConfig, Location
+
+# Raíz del repositorio, para importar el paquete desde un subproceso
+ROOT = Path(__file__).resolve().parents[2]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """Cliente con tres ubicaciones y la cache SQLite en un directorio temporal"""
+    monkeypatch.chdir(tmp_path)
+    config = WeatherConfig()
+    config.LOCATIONS = [
+        Location("first", 10.0, 10.0),
+        Location("second", 20.0, 20.0),
+        Location("third", 30.0, 30.0),
+    ]
+    return WeatherAPIClient(config)
+
+
+class TestFetchAllLocations:
+    """Tests para WeatherAPIClient._fetch_all_locations"""
+    
+    def test_results_keep_configuration_order(self, client):
+        """Test los resultados respetan el orden de configuración aunque terminen desordenados"""
+        delays = {"first": 0.06, "second": 0.03, "third": 0.0}
+        
+        def fetch(location):
+            time.sleep(delays[location.name])
+            return pd.DataFrame({"location": [location.name]})
+        
+        results = client._fetch_all_locations(fetch, "sin datos para")
+        
+        assert list(results) == ["first", "second", "third"]
+        assert results["second"]["location"].tolist() == ["second"]
+    
+    def test_empty_results_are_dropped(self, client, caplog):
+        """Test las ubicaciones sin datos no aparecen en el resultado"""
+        def fetch(location):
+            if location.name == "second":
+                return pd.DataFrame()
+            return pd.DataFrame({"location": [location.name]})
+        
+        with caplog.at_level("WARNING"):
+            results = client._fetch_all_locations(fetch, "sin datos para")
+        
+        assert list(results) == ["first", "third"]
+        assert "sin datos para second" in caplog.text
+    
+    def test_each_thread_uses_its_own_session(self, client):
+        """Test cada thread usa su propio cliente OpenMeteo (sesión no compartida)"""
+        barrier = threading.Barrier(len(client.config.LOCATIONS))
+        sessions = {}
+        
+        def fetch(location):
+            barrier.wait(timeout=5)  # todas las ubicaciones en threads distintos
+            sessions[location.name] = client._get_openmeteo()
+            assert client._get_openmeteo() is sessions[location.name]
+            return pd.DataFrame({"location": [location.name]})
+        
+        client._fetch_all_locations(fetch, "sin datos para")
+        
+        assert len({id(s) for s in sessions.values()}) == 3
+        assert client.openmeteo not in sessions.values()
+
+
+class TestClientStartup:
+    """Tests para la validación de ubicaciones al crear el cliente"""
+    
+    def test_invalid_location_rejected_at_startup(self, tmp_path, monkeypatch):
+        """Test una ubicación fuera de rango se rechaza al crear el cliente"""
+        monkeypatch.chdir(tmp_path)
+        location = Location("valid", 41.6005, -93.6091)
+        location.lat = 95.0  # Saltear __post_init__ para simular config inválida
+        config = WeatherConfig()
+        config.LOCATIONS = [location]
+        
+        with pytest.raises(ValueError, match="Latitud inválida"):
+            WeatherAPIClient(config)
+    
+    def test_invalid_location_rejected_with_optimizations(self, tmp_path):
+        """Test con `python -O` (sin __post_init__) la ubicación igual se rechaza"""
+        code = (
+            "from weather_data_collector.api_client import WeatherAPIClient\n"
+            "from weather_data_collector.config import WeatherConfig, Location\n"
+            "config = WeatherConfig()\n"
+            "config.LOCATIONS = [Location('bad', 41.6, 200.0)]\n"
+            "WeatherAPIClient(config)\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-O", "-c", code],
+            cwd=tmp_path, capture_output=True, text=True,
+            env={**os.environ, "PYTHONPATH": str(ROOT)},
+        )
+        
+        assert result.returncode != 0
+        assert "Longitud inválida" in result.stderr
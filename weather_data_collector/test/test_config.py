@@ -99,6 +99,24 @@ class TestWeatherConfig:
         # La validación debe ser exitosa
         assert config.validate_config() == True
     
+    def test_validate_locations_success(self):
+        """Test que las ubicaciones configuradas pasan la validación vectorizada"""
+        assert WeatherConfig.validate_locations() == True
+    
+    def test_validate_locations_invalid_latitude(self):
+        """Test que una latitud fuera de rango se detecta en lote"""
+        location = Location("valid", 41.6005, -93.6091)
+        location.lat = 95.0  # Saltear __post_init__ para simular config inválida
+        
+        class BadConfig(WeatherConfig):
+            LOCATIONS = [WeatherConfig.LOCATIONS[0], location]
+        
+        with pytest.raises(ValueError, match="Latitud inválida"):
+            BadConfig.validate_locations()
+        
+        with pytest.raises(ValueError, match="Latitud inválida"):
+            BadConfig.validate_config()
+    
     def test_daily_variables_not_empty(self):
         """Test que hay variables meteorológicas configuradas"""
         config = WeatherConfig()
@@ -107,6 +125,13 @@ class TestWeatherConfig:
         assert "temperature_2m_max" in config.DAILY_VARIABLES
         assert "precipitation_sum" in config.DAILY_VARIABLES
     
+    def test_daily_dtypes_cover_variables(self):
+        """Test que cada variable meteorológica tiene un dtype definido"""
+        config = WeatherConfig()
+        
+        for var in config.DAILY_VARIABLES:
+            assert var in config.DAILY_DTYPES
+    
     def test_locations_have_valid_coordinates(self):
         """Test que todas las ubicaciones tienen coordenadas válidas"""
         config = WeatherConfig()
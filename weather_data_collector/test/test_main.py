@@ -0,0 +1,128 @@
+"""
+Tests unitarios para el pipeline principal.
+
+Valida la combinación de datos históricos y de pronóstico.
+"""
+
+import pytest
+import pandas as pd
+
+from weather_data_collector.scripts.main import WeatherDataPipeline
+from weather_data_collector.config import Location
+
+
+@pytest.fixture
+def pipeline(tmp_path, monkeypatch):
+    """Pipeline con cache y directorio de salida en un directorio temporal"""
+    monkeypatch.chdir(tmp_path)
+    return WeatherDataPipeline()
+
+
+def make_daily(start: str, periods: int, source: str) -> pd.DataFrame:
+    """DataFrame diario de una ubicación con el origen de cada fila"""
+    return pd.DataFrame({
+        'date': pd.date_range(start, periods=periods, tz='UTC'),
+        'location': 'test_location',
+        'source': source,
+    })
+
+
+def legacy_merge(df_historical: pd.DataFrame, df_forecast: pd.DataFrame) -> pd.DataFrame:
+    """Combinación original: concat + drop_duplicates(keep='last') + orden por fecha"""
+    df_combined = pd.concat([df_historical, df_forecast], ignore_index=True)
+    df_combined = df_combined.sort_values(['date', 'location'])
+    df_combined = df_combined.drop_duplicates(subset=['date', 'location'], keep='last')
+    return df_combined.sort_values('date').reset_index(drop=True)
+
+
+class TestMergeDatasets:
+    """Tests para WeatherDataPipeline.merge_datasets"""
+    
+    location = Location("test_location", 41.6, -93.6)
+    
+    def test_keeps_historical_after_forecast_window(self, pipeline):
+        """Test los históricos posteriores al pronóstico no se descartan"""
+        df_historical = make_daily('2025-01-01', 20, 'historical')
+        df_forecast = make_daily('2025-01-05', 4, 'forecast')
+        
+        combined = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        
+        assert len(combined) == 20
+        assert combined['date'].is_monotonic_increasing
+        assert (combined['source'] == 'forecast').sum() == 4
+        assert combined['date'].iloc[-1] == df_historical['date'].iloc[-1]
+    
+    def test_sorted_overlap_matches_legacy_merge(self, pipeline):
+        """Test el corte por fecha (datos ordenados) coincide con el merge original"""
+        df_historical = make_daily('2025-01-01', 10, 'historical')
+        df_forecast = make_daily('2025-01-08', 7, 'forecast')
+        
+        combined = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        
+        pd.testing.assert_frame_equal(combined, legacy_merge(df_historical, df_forecast))
+    
+    def test_sorted_historical_past_forecast_matches_legacy_merge(self, pipeline):
+        """Test el corte por fecha conserva históricos a ambos lados del pronóstico"""
+        df_historical = make_daily('2025-01-01', 30, 'historical')
+        df_forecast = make_daily('2025-01-10', 5, 'forecast')
+        
+        combined = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        
+        pd.testing.assert_frame_equal(combined, legacy_merge(df_historical, df_forecast))
+    
+    def test_sorted_forecast_with_gap_matches_legacy_merge(self, pipeline):
+        """Test los históricos de días que faltan en el pronóstico se conservan"""
+        df_historical = make_daily('2025-01-01', 20, 'historical')
+        df_forecast = make_daily('2025-01-08', 7, 'forecast').drop(index=[2, 3])
+        
+        combined = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        
+        assert len(combined) == 20
+        assert (combined['source'] == 'forecast').sum() == 5
+        pd.testing.assert_frame_equal(combined, legacy_merge(df_historical, df_forecast))
+    
+    def test_unsorted_overlap_matches_legacy_merge(self, pipeline):
+        """Test el merge general (datos desordenados) coincide con el merge original"""
+        df_historical = make_daily('2025-01-01', 10, 'historical').sample(frac=1, random_state=0)
+        df_forecast = make_daily('2025-01-08', 7, 'forecast').sample(frac=1, random_state=1)
+        
+        combined = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        
+        pd.testing.assert_frame_equal(combined, legacy_merge(df_historical, df_forecast))
+    
+    def test_unsorted_historical_past_forecast_matches_legacy_merge(self, pipeline):
+        """Test el merge general conserva históricos posteriores al pronóstico"""
+        df_historical = make_daily('2025-01-01', 30, 'historical').sample(frac=1, random_state=2)
+        df_forecast = make_daily('2025-01-10', 5, 'forecast')
+        
+        combined = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        
+        pd.testing.assert_frame_equal(combined, legacy_merge(df_historical, df_forecast))
+    
+    def test_merge_unsorted_matches_cutoff_on_sorted_data(self, pipeline):
+        """Test ambos caminos dan el mismo resultado sobre los mismos datos"""
+        df_historical = make_daily('2025-01-01', 30, 'historical')
+        df_forecast = make_daily('2025-01-10', 5, 'forecast')
+        
+        cutoff = pipeline.merge_datasets(self.location, df_historical, df_forecast)
+        general = WeatherDataPipeline._merge_unsorted(df_historical, df_forecast)
+        
+        pd.testing.assert_frame_equal(general, cutoff)
+    
+    def test_merge_unsorted_multiple_locations(self):
+        """Test el merge general deduplica por (location, date), no solo por fecha"""
+        df_historical = pd.concat([
+            make_daily('2025-01-01', 10, 'historical'),
+            make_daily('2025-01-01', 10, 'historical').assign(location='other_location'),
+        ], ignore_index=True).sample(frac=1, random_state=3)
+        df_forecast = make_daily('2025-01-08', 7, 'forecast')
+        
+        general = WeatherDataPipeline._merge_unsorted(df_historical, df_forecast)
+        expected = legacy_merge(df_historical, df_forecast)
+        
+        by_key = ['date', 'location']
+        pd.testing.assert_frame_equal(
+            general.sort_values(by_key, ignore_index=True),
+            expected.sort_values(by_key, ignore_index=True)
+        )
+        assert general['date'].is_monotonic_increasing
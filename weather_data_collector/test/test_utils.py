@@ -4,47 +4,42 @@ Tests unitarios para el módulo de utilidades.
 Valida funciones de guardado, carga y validación de datos meteorológicos.
 """
 
+import sys
+
 import pytest
 import pandas as pd
-import tempfile
-import os
-from pathlib import Path
 import json
 
+from weather_data_collector import utils
 from weather_data_collector.utils import DataUtils
 from weather_data_collector.config import Location
 
+@pytest.fixture(scope="class")
+def sample_df():
+    """DataFrame de ejemplo compartido por los tests de la clase"""
+    return pd.DataFrame({
+        'date': ['2025-01-01', '2025-01-02', '2025-01-03'],
+        'location': ['test_location', 'test_location', 'test_location'],
+        'temperature_2m_max': [25.5, 26.0, 24.8],
+        'temperature_2m_min': [15.2, 16.1, 14.9],
+        'precipitation_sum': [0.0, 2.5, 0.1]
+    })
+
+
+@pytest.fixture(scope="class")
+def empty_df():
+    """DataFrame vacío para tests"""
+    return pd.DataFrame()
+
+
 class TestDataUtils:
     """Tests para la clase DataUtils"""
     
-    def setup_method(self):
-        """Preparar datos de prueba para cada test"""
-        # DataFrame de ejemplo
-        self.sample_df = pd.DataFrame({
-            'date': ['2025-01-01', '2025-01-02', '2025-01-03'],
-            'location': ['test_location', 'test_location', 'test_location'],
-            'temperature_2m_max': [25.5, 26.0, 24.8],
-            'temperature_2m_min': [15.2, 16.1, 14.9],
-            'precipitation_sum': [0.0, 2.5, 0.1]
-        })
-        
-        # DataFrame vacío para tests
-        self.empty_df = pd.DataFrame()
-        
-        # Directorio temporal
-        self.temp_dir = tempfile.mkdtemp()
-    
-    def teardown_method(self):
-        """Limpiar después de cada test"""
-        import shutil
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
-    
-    def test_save_to_json_success(self):
+    def test_save_to_json_success(self, tmp_path, sample_df):
         """Test guardar JSON exitosamente"""
-        output_path = Path(self.temp_dir) / "test_weather.json"
+        output_path = tmp_path / "test_weather.json"
         
-        result = DataUtils.save_to_json(self.sample_df, output_path)
+        result = DataUtils.save_to_json(sample_df, output_path)
         
         assert result == True
         assert output_path.exists()
@@ -54,64 +49,188 @@ class TestDataUtils:
             lines = f.readlines()
             assert len(lines) == 3  # 3 registros
     
-    def test_save_to_json_empty_dataframe(self):
+    def test_save_to_json_matches_pandas_format(self, tmp_path, sample_df):
+        """Test que el JSON Lines escrito coincide con pandas.to_json"""
+        df = sample_df.copy()
+        df['date'] = pd.to_datetime(df['date'], utc=True)
+        df['temperature_2m_max'] = df['temperature_2m_max'].astype('float32')
+        df.loc[1, 'precipitation_sum'] = None
+        output_path = tmp_path / "format.json"
+        
+        assert DataUtils.save_to_json(df, output_path) == True
+        
+        expected = df.to_json(orient="records", lines=True, 
+                              date_format="iso", force_ascii=False)
+        assert output_path.read_text() == expected
+    
+    def test_save_to_json_empty_dataframe(self, tmp_path, empty_df):
         """Test guardar DataFrame vacío retorna False"""
-        output_path = Path(self.temp_dir) / "empty.json"
+        output_path = tmp_path / "empty.json"
         
-        result = DataUtils.save_to_json(self.empty_df, output_path)
+        result = DataUtils.save_to_json(empty_df, output_path)
         
         assert result == False
         assert not output_path.exists()
     
-    def test_save_to_csv_success(self):
+    def test_save_to_csv_success(self, tmp_path, sample_df):
         """Test guardar CSV exitosamente"""
-        output_path = Path(self.temp_dir) / "test_weather.csv"
+        output_path = tmp_path / "test_weather.csv"
         
-        result = DataUtils.save_to_csv(self.sample_df, output_path)
+        result = DataUtils.save_to_csv(sample_df, output_path)
         
         assert result == True
         assert output_path.exists()
         
         # Verificar que se puede cargar
-        loaded_df = pd.read_csv(output_path)
+        loaded_df = pd.read_csv(output_path, engine="pyarrow", dtype_backend="pyarrow")
+        assert len(loaded_df) == 3
+    
+    def test_save_to_csv_chunked_matches_single_write(self, tmp_path, sample_df):
+        """Test escribir CSV por bloques produce el mismo archivo"""
+        single_path = tmp_path / "single.csv"
+        chunked_path = tmp_path / "chunked.csv"
+        
+        DataUtils.save_to_csv(sample_df, single_path)
+        DataUtils.save_to_csv(sample_df, chunked_path, chunk_size=2)
+        
+        assert chunked_path.read_bytes() == single_path.read_bytes()
+    
+    def test_load_csv_usecols(self, tmp_path, sample_df):
+        """Test cargar solo algunas columnas de CSV con dtypes de Arrow"""
+        output_path = tmp_path / "test_weather.csv"
+        DataUtils.save_to_csv(sample_df, output_path)
+        
+        loaded_df = DataUtils.load_csv(output_path, usecols=['location', 'precipitation_sum'])
+        
+        assert list(loaded_df.columns) == ['location', 'precipitation_sum']
+        assert isinstance(loaded_df['location'].dtype, pd.ArrowDtype)
+        assert loaded_df['precipitation_sum'].tolist() == [0.0, 2.5, 0.1]
+    
+    def test_load_csv_file_not_found(self, tmp_path):
+        """Test cargar CSV inexistente"""
+        assert DataUtils.load_csv(tmp_path / "nonexistent.csv") is None
+    
+    def test_load_csv_batched(self, tmp_path, sample_df):
+        """Test leer CSV por bloques"""
+        output_path = tmp_path / "test_weather.csv"
+        DataUtils.save_to_csv(sample_df, output_path)
+        
+        chunks = list(DataUtils.load_csv_batched(output_path, chunk_size=2))
+        
+        assert [len(chunk) for chunk in chunks] == [2, 1]
+        assert list(chunks[0].columns) == list(sample_df.columns)
+    
+    def test_save_and_load_parquet(self, tmp_path, sample_df):
+        """Test guardar y cargar Parquet conserva datos y tipos"""
+        output_path = tmp_path / "test_weather.parquet"
+        
+        result = DataUtils.save_to_parquet(sample_df, output_path)
+        
+        assert result == True
+        assert output_path.exists()
+        
+        loaded_df = DataUtils.load_parquet(output_path)
+        assert loaded_df is not None
         assert len(loaded_df) == 3
+        assert list(loaded_df.columns) == list(sample_df.columns)
+        # La fecha se guarda como timestamp, no como texto
+        assert pd.api.types.is_datetime64_any_dtype(loaded_df['date'])
+        assert loaded_df['temperature_2m_max'].tolist() == [25.5, 26.0, 24.8]
+    
+    def test_load_parquet_columns(self, tmp_path, sample_df):
+        """Test cargar solo algunas columnas de Parquet"""
+        output_path = tmp_path / "test_weather.parquet"
+        DataUtils.save_to_parquet(sample_df, output_path)
+        
+        loaded_df = DataUtils.load_parquet(output_path, columns=['date', 'precipitation_sum'])
+        
+        assert list(loaded_df.columns) == ['date', 'precipitation_sum']
+    
+    def test_save_to_parquet_empty_dataframe(self, tmp_path, empty_df):
+        """Test guardar DataFrame vacío en Parquet retorna False"""
+        output_path = tmp_path / "empty.parquet"
+        
+        result = DataUtils.save_to_parquet(empty_df, output_path)
+        
+        assert result == False
+        assert not output_path.exists()
     
-    def test_validate_columns_success(self):
+    def test_validate_columns_success(self, sample_df):
         """Test validación de columnas exitosa"""
         expected_columns = ['date', 'location', 'temperature_2m_max']
         
-        result = DataUtils.validate_columns(self.sample_df, expected_columns)
+        result = DataUtils.validate_columns(sample_df, expected_columns)
         
         assert result == True
     
-    def test_validate_columns_missing(self):
+    def test_validate_columns_missing(self, sample_df):
         """Test validación falla con columnas faltantes"""
         expected_columns = ['date', 'location', 'nonexistent_column']
         
-        result = DataUtils.validate_columns(self.sample_df, expected_columns)
+        result = DataUtils.validate_columns(sample_df, expected_columns)
         
         assert result == False
     
-    def test_validate_columns_strict_mode(self):
+    def test_validate_columns_strict_mode(self, sample_df):
         """Test validación estricta rechaza columnas extra"""
         expected_columns = ['date', 'location']  # Faltan columnas
         
-        result = DataUtils.validate_columns(self.sample_df, expected_columns, strict=True)
+        result = DataUtils.validate_columns(sample_df, expected_columns, strict=True)
         
         assert result == False
     
-    def test_validate_data_quality_success(self):
+    def test_validate_columns_logs_all_missing(self, sample_df, caplog):
+        """Test el log lista todas las columnas faltantes"""
+        expected_columns = ['date', 'wind_speed', 'humidity']
+        
+        with caplog.at_level("ERROR"):
+            result = DataUtils.validate_columns(sample_df, expected_columns)
+        
+        assert result == False
+        assert "['wind_speed', 'humidity']" in caplog.text  # orden esperado
+    
+    def test_validate_columns_logs_extra_in_dataframe_order(self, sample_df, caplog):
+        """Test el log lista las columnas extra en el orden del DataFrame"""
+        with caplog.at_level("ERROR"):
+            result = DataUtils.validate_columns(sample_df, ['location', 'date'], strict=True)
+        
+        assert result == False
+        assert "['temperature_2m_max', 'temperature_2m_min', 'precipitation_sum']" in caplog.text
+    
+    def test_validate_columns_module_function(self, sample_df):
+        """Test la fachada DataUtils delega en la función del módulo"""
+        assert DataUtils.validate_columns is utils.validate_columns
+        assert utils.validate_columns(sample_df, ['date', 'location'], strict=True) == False
+        assert utils.validate_columns(sample_df, ['date', 'location']) == True
+    
+    def test_facade_exposes_only_public_api(self):
+        """Test la fachada DataUtils no reexporta helpers privados"""
+        private = [name for name in vars(DataUtils) 
+                   if name.startswith('_') and not name.startswith('__')]
+        
+        assert private == []
+    
+    def test_validate_data_quality_success(self, sample_df):
         """Test validación de calidad exitosa"""
-        report = DataUtils.validate_data_quality(self.sample_df, "test_location")
+        report = DataUtils.validate_data_quality(sample_df, "test_location")
         
         assert report["status"] in ["ok", "warning"]
         assert report["location"] == "test_location"
         assert report["total_records"] == 3
         assert "date_range" in report
     
-    def test_validate_data_quality_empty_dataframe(self):
+    def test_validate_data_quality_does_not_modify_input(self, sample_df):
+        """Test que la validación no modifica el DataFrame recibido"""
+        original = sample_df.copy()
+        
+        report = DataUtils.validate_data_quality(sample_df, "test_location")
+        
+        assert report["date_range"] == {"start": "2025-01-01", "end": "2025-01-03"}
+        pd.testing.assert_frame_equal(sample_df, original)
+    
+    def test_validate_data_quality_empty_dataframe(self, empty_df):
         """Test validación de DataFrame vacío"""
-        report = DataUtils.validate_data_quality(self.empty_df, "empty")
+        report = DataUtils.validate_data_quality(empty_df, "empty")
         
         assert report["status"] == "error"
         assert "DataFrame vacío" in report["message"]
@@ -131,6 +250,42 @@ class TestDataUtils:
         assert report["status"] == "warning"
         assert len(report["data_issues"]) > 0
     
+    def test_compress_weather_roundtrip(self, sample_df):
+        """Test temperaturas a int16 (décimas de grado) y de vuelta a °C"""
+        compressed = DataUtils.compress_weather(sample_df)
+        
+        assert compressed['temperature_2m_max'].dtype == 'int16'
+        assert compressed['temperature_2m_max'].tolist() == [255, 260, 248]
+        assert sample_df['temperature_2m_max'].dtype == 'float64'  # sin modificar
+        
+        restored = DataUtils.decompress_weather(compressed)
+        assert restored['temperature_2m_min'].tolist() == pytest.approx([15.2, 16.1, 14.9], abs=1e-5)
+    
+    def test_validate_data_quality_compressed_temperatures(self, sample_df):
+        """Test validación de rangos con temperaturas en décimas de grado"""
+        compressed = DataUtils.compress_weather(sample_df)
+        assert DataUtils.validate_data_quality(compressed)["status"] == "ok"
+        
+        extreme = DataUtils.compress_weather(
+            sample_df.assign(temperature_2m_max=[25.5, 65.0, 24.8])
+        )
+        report = DataUtils.validate_data_quality(extreme)
+        assert any("fuera de rango" in issue for issue in report["data_issues"])
+    
+    @pytest.mark.parametrize("dtype", ["int64", "int64[pyarrow]"])
+    def test_validate_data_quality_unquantized_integer_temperatures(self, dtype):
+        """Test temperaturas enteras sin marca de compress_weather se validan en °C"""
+        int_df = pd.DataFrame({
+            'temperature_2m_max': [70, 20, 25],
+            'temperature_2m_min': [-80, 10, 15]
+        }).astype(dtype)
+    
+        report = DataUtils.validate_data_quality(int_df, "int_location")
+    
+        assert report["status"] == "warning"
+        assert sum("fuera de rango" in issue for issue in report["data_issues"]) == 2
+        assert DataUtils.decompress_weather(int_df) is int_df  # sin marca: sin cambios
+    
     def test_generate_filename(self):
         """Test generación de nombres de archivo"""
         filename = DataUtils.generate_filename("test location", "weather", "json")
@@ -139,11 +294,11 @@ class TestDataUtils:
         assert filename.endswith(".json")
         assert " " not in filename  # Sin espacios
     
-    def test_load_json_data_success(self):
+    def test_load_json_data_success(self, tmp_path, sample_df):
         """Test cargar datos JSON exitosamente"""
         # Primero guardar un archivo
-        output_path = Path(self.temp_dir) / "test_load.json"
-        DataUtils.save_to_json(self.sample_df, output_path)
+        output_path = tmp_path / "test_load.json"
+        DataUtils.save_to_json(sample_df, output_path)
         
         # Luego cargarlo
         loaded_df = DataUtils.load_json_data(output_path)
@@ -152,29 +307,181 @@ class TestDataUtils:
         assert len(loaded_df) == 3
         assert 'location' in loaded_df.columns
     
-    def test_load_json_data_file_not_found(self):
+    def test_load_json_data_arrow_dtypes(self, tmp_path, sample_df):
+        """Test texto y fechas se cargan con dtypes de Arrow"""
+        output_path = tmp_path / "test_arrow.json"
+        DataUtils.save_to_json(sample_df, output_path)
+        
+        loaded_df = DataUtils.load_json_data(output_path)
+        
+        assert isinstance(loaded_df['location'].dtype, pd.ArrowDtype)
+        assert isinstance(loaded_df['date'].dtype, pd.ArrowDtype)
+        assert pd.api.types.is_datetime64_any_dtype(loaded_df['date'])
+        
+        report = DataUtils.validate_data_quality(loaded_df, "test_location")
+        assert report["date_range"] == {"start": "2025-01-01", "end": "2025-01-03"}
+    
+    def test_load_json_data_array_format(self, tmp_path, sample_df):
+        """Test cargar JSON normal (array) con fechas convertidas"""
+        output_path = tmp_path / "test_array.json"
+        sample_df.to_json(output_path, orient="records")
+        
+        loaded_df = DataUtils.load_json_data(output_path)
+        
+        assert loaded_df is not None
+        assert len(loaded_df) == 3
+        assert pd.api.types.is_datetime64_any_dtype(loaded_df['date'])
+        assert loaded_df['precipitation_sum'].dtype == 'float32'
+        assert loaded_df['precipitation_sum'].tolist() == pytest.approx([0.0, 2.5, 0.1])
+    
+    def test_load_json_data_epoch_dates(self, tmp_path, sample_df):
+        """Test fechas en epoch (milisegundos, como las escribe to_json) se convierten"""
+        output_path = tmp_path / "test_epoch.json"
+        epoch_ms = [1735689600000, 1735776000000, 1735862400000]
+        sample_df.assign(date=epoch_ms).to_json(output_path, orient="records")
+        
+        loaded_df = DataUtils.load_json_data(output_path)
+        
+        assert loaded_df['date'].dt.strftime('%Y-%m-%d').tolist() == sample_df['date'].tolist()
+    
+    def test_load_json_data_same_schema_for_every_reader(self, tmp_path, sample_df):
+        """Test Arrow, orjson y pandas devuelven los mismos dtypes del esquema"""
+        # weather_code entero en valor: read_json lo bajaría a int64
+        df = sample_df.assign(weather_code=[3.0, 61.0, 0.0])
+        lines_path = tmp_path / "lines.json"
+        array_path = tmp_path / "array.json"
+        DataUtils.save_to_json(df, lines_path)
+        df.to_json(array_path, orient="records")
+        
+        from_arrow = DataUtils.load_json_data(lines_path)
+        from_orjson = DataUtils.load_json_data(array_path)
+        from_pandas = utils._load_json_pandas(lines_path)
+        
+        assert from_arrow['weather_code'].dtype == 'float32'
+        assert from_arrow['temperature_2m_max'].dtype == 'float32'
+        pd.testing.assert_frame_equal(from_orjson, from_arrow)
+        pd.testing.assert_frame_equal(from_pandas, from_arrow)
+    
+    def test_load_json_pandas_detects_format(self, tmp_path, sample_df):
+        """Test el cargador de pandas (sin orjson) detecta array y JSON Lines"""
+        array_path = tmp_path / "array.json"
+        lines_path = tmp_path / "lines.json"
+        sample_df.to_json(array_path, orient="records")
+        sample_df.to_json(lines_path, orient="records", lines=True)
+        
+        from_array = utils._load_json_pandas(array_path)
+        from_lines = utils._load_json_pandas(lines_path)
+        
+        assert len(from_array) == 3
+        pd.testing.assert_frame_equal(from_array, from_lines)
+    
+    def test_load_json_lines_parallel_matches_sequential(self, tmp_path, sample_df):
+        """Test el parseo paralelo por bloques da el mismo resultado"""
+        output_path = tmp_path / "test_parallel.json"
+        DataUtils.save_to_json(sample_df, output_path)
+        
+        sequential = DataUtils.load_json_data(output_path)
+        parallel = utils._load_json_lines_parallel(output_path, workers=2)
+        
+        pd.testing.assert_frame_equal(parallel, sequential)
+    
+    @pytest.mark.parametrize("workers", [1, 2])
+    def test_load_json_lines_parallel_mixed_types(self, tmp_path, workers):
+        """Test tipos mezclados en una columna: igual que la lectura única"""
+        # 51 enteros y 50 textos del mismo largo: con 2 workers cada bloque
+        # es homogéneo y los tipos se mezclan al unir los bloques
+        output_path = tmp_path / "test_mixed.json"
+        lines = [json.dumps({"station": 10000 + i}) for i in range(51)]
+        lines += [json.dumps({"station": f"x{i:02d}"}) for i in range(50)]
+        output_path.write_text("\n".join(lines) + "\n")
+        
+        parallel = utils._load_json_lines_parallel(output_path, workers=workers)
+        single = DataUtils.load_json_data(output_path)  # Arrow lo rechaza
+        
+        assert parallel["station"].iloc[[0, -1]].tolist() == [10000, "x49"]
+        pd.testing.assert_frame_equal(parallel, single)
+    
+    def test_load_json_data_parallel_without_pyarrow(self, tmp_path, monkeypatch, sample_df):
+        """Test sin el lector de Arrow, un JSON Lines grande se parsea por bloques"""
+        output_path = tmp_path / "test_large.json"
+        DataUtils.save_to_json(pd.concat([sample_df] * 100, ignore_index=True), output_path)
+        
+        calls = []
+        parse_parallel = utils._load_json_lines_parallel
+        
+        def spy(file_path):
+            calls.append(file_path)
+            return parse_parallel(file_path, workers=2)
+        
+        monkeypatch.setattr(utils, "_load_json_lines_parallel", spy)
+        monkeypatch.setattr(utils, "PARALLEL_PARSE_MIN_BYTES", 0)
+        # Sin el lector JSON de Arrow (pandas sigue usando pyarrow para texto)
+        monkeypatch.setitem(sys.modules, "pyarrow.json", None)
+        
+        loaded = DataUtils.load_json_data(output_path)
+        
+        assert calls == [output_path]
+        assert len(loaded) == 300
+        assert pd.api.types.is_datetime64_any_dtype(loaded['date'])
+        assert loaded['date'].dt.strftime('%Y-%m-%d').tolist()[:3] == sample_df['date'].tolist()
+        assert loaded['temperature_2m_max'].dtype == 'float32'
+        assert loaded['precipitation_sum'].tolist()[:3] == pytest.approx([0.0, 2.5, 0.1])
+    
+    def test_load_json_data_skips_parallel_when_arrow_rejects(self, tmp_path, monkeypatch, sample_df):
+        """Test si Arrow rechaza el archivo no se intenta el parseo por bloques"""
+        output_path = tmp_path / "test_array.json"
+        sample_df.to_json(output_path, orient="records")
+        
+        def fail_parallel(file_path):
+            raise AssertionError("no debe parsearse por bloques")
+        
+        monkeypatch.setattr(utils, "_load_json_lines_parallel", fail_parallel)
+        monkeypatch.setattr(utils, "PARALLEL_PARSE_MIN_BYTES", 0)
+        
+        loaded = DataUtils.load_json_data(output_path)
+        
+        assert loaded is not None
+        assert len(loaded) == 3
+    
+    def test_load_json_data_io_error_not_retried(self, tmp_path, monkeypatch, caplog):
+        """Test un error de E/S se registra una vez, sin probar otros lectores"""
+        dir_path = tmp_path / "directory.json"
+        dir_path.mkdir()
+        
+        def fail_read_bytes(self):
+            raise AssertionError("no debe releerse con otro lector")
+        
+        monkeypatch.setattr(utils.Path, "read_bytes", fail_read_bytes)
+        with caplog.at_level("ERROR"):
+            result = DataUtils.load_json_data(dir_path)
+        
+        assert result is None
+        assert len(caplog.records) == 1
+        assert "is a directory" in caplog.text
+    
+    def test_load_json_data_file_not_found(self, tmp_path):
         """Test cargar archivo inexistente retorna None"""
-        nonexistent_path = Path(self.temp_dir) / "nonexistent.json"
+        nonexistent_path = tmp_path / "nonexistent.json"
         
         result = DataUtils.load_json_data(nonexistent_path)
         
         assert result is None
     
-    def test_preview_data_with_data(self):
+    def test_preview_data_with_data(self, sample_df):
         """Test previsualización con datos (no genera errores)"""
         # Este test solo verifica que no genere errores
         try:
-            DataUtils.preview_data(self.sample_df, n=2)
+            DataUtils.preview_data(sample_df, n=2)
             success = True
         except Exception:
             success = False
         
         assert success == True
     
-    def test_preview_data_empty(self):
+    def test_preview_data_empty(self, empty_df):
         """Test previsualización con DataFrame vacío"""
         try:
-            DataUtils.preview_data(self.empty_df)
+            DataUtils.preview_data(empty_df)
             success = True
         except Exception:
             success = False
@@ -5,51 +5,147 @@ Funciones auxiliares para guardar datos, validar DataFrames y realizar
 análisis básicos de calidad de datos.
 """
 
+from __future__ import annotations
+
 import os
+import mmap
+import string
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Union
-import pandas as pd
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Iterator, Union
 import json
 
+# pandas/numpy dominan el arranque: se importan dentro de cada función que
+# los usa, así generate_filename y validate_columns no los cargan
+if TYPE_CHECKING:
+    import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: se usa pandas.to_json si no está
+    orjson = None  # type: ignore[assignment]
+
 logger = logging.getLogger(__name__)
 
-class DataUtils:
+# Decimales que usa pandas.to_json por defecto (double_precision)
+JSON_DOUBLE_PRECISION = 10
+
+# Temperaturas guardables como int16 en décimas de grado (10 × °C)
+TEMPERATURE_COLUMNS = ('temperature_2m_max', 'temperature_2m_min')
+TEMPERATURE_SCALE = 10
+# Clave de df.attrs con la que compress_weather marca las temperaturas escaladas
+TEMPERATURE_SCALE_ATTR = 'temperature_scale'
+
+# Buffer de escritura para archivos de salida
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Filas por bloque al escribir/leer CSV grandes
+CSV_CHUNK_SIZE = 50_000
+
+# Tamaño a partir del cual los JSON Lines se parsean en paralelo por bloques
+# (solo sin pyarrow: su lector ya es multihilo)
+PARALLEL_PARSE_MIN_BYTES = 64 << 20
+
+# Minúsculas y espacios a '_' en una sola pasada (nombres ASCII)
+_FILENAME_TRANS = str.maketrans(
+    dict(zip(string.ascii_uppercase, string.ascii_lowercase)) | {" ": "_"}
+)
+
+
+@lru_cache(maxsize=4)
+def _date_stamp(day: date) -> str:
+    """Fecha en formato YYYYMMDD, formateada una vez por día."""
+    return day.strftime("%Y%m%d")
+
+
+def _open_for_sequential_write(output_path: Path):
     """
-    Utilidades para manejo y validación de datos meteorológicos.
+    Abre un archivo para escritura secuencial con buffer grande.
+    
+    Indica al kernel que el acceso es secuencial (donde posix_fadvise
+    existe) para que agrupe mejor el writeback.
+    """
+    fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    if hasattr(os, "posix_fadvise"):
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+    return os.fdopen(fd, "wb", buffering=WRITE_BUFFER_SIZE)
+
+
+def _parse_json_lines_chunk(file_path: str, start: int, end: int):
     """
+    Parsea un bloque de líneas [start, end) de un archivo JSON Lines.
     
-    @staticmethod
-    def save_to_json(df: pd.DataFrame, 
-                    output_path: Union[str, Path], 
-                    orient: str = "records",
-                    lines: bool = True,
-                    date_format: str = "iso") -> bool:
-        """
-        Guarda el DataFrame en formato JSON con manejo robusto de errores.
-        
-        Args:
-            df: DataFrame a guardar
-            output_path: Ruta del archivo de salida
-            orient: Orientación del JSON ('records', 'index', 'values', etc.)
-            lines: Si usar formato JSON Lines
-            date_format: Formato de fechas ('iso', 'epoch', etc.)
-            
-        Returns:
-            bool: True si se guardó correctamente, False en caso contrario
-        """
-        try:
-            output_path = Path(output_path)
-            
-            # Crear directorio si no existe
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Validar que el DataFrame no esté vacío
-            if df.empty:
-                logger.warning("⚠️ DataFrame vacío, no se guardará archivo")
-                return False
-            
-            # Guardar archivo
+    Se ejecuta en un proceso worker: mapea el archivo en memoria y devuelve
+    el bloque como DataFrame (columnar, más barato de enviar entre procesos
+    que la lista de registros).
+    """
+    import pandas as pd
+    
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            records = [orjson.loads(line) for line in mm[start:end].split(b'\n') if line.strip()]
+    
+    return pd.DataFrame.from_records(records)
+
+
+def _arrow_types_mapper(arrow_type):
+    """
+    types_mapper para Table.to_pandas: texto y timestamps quedan como
+    ArrowDtype (sin materializar objetos Python); el resto, dtypes de numpy.
+    """
+    import pandas as pd
+    import pyarrow as pa
+    
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type) \
+            or pa.types.is_timestamp(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    return None
+
+
+def save_to_json(df: pd.DataFrame, 
+                 output_path: Union[str, Path], 
+                 orient: str = "records",
+                 lines: bool = True,
+                 date_format: str = "iso") -> bool:
+    """
+    Guarda el DataFrame en formato JSON con manejo robusto de errores.
+    
+    Args:
+        df: DataFrame a guardar
+        output_path: Ruta del archivo de salida
+        orient: Orientación del JSON ('records', 'index', 'values', etc.)
+        lines: Si usar formato JSON Lines
+        date_format: Formato de fechas ('iso', 'epoch', etc.)
+        
+    Returns:
+        bool: True si se guardó correctamente, False en caso contrario
+    """
+    try:
+        output_path = Path(output_path)
+        
+        # Crear directorio si no existe
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # Validar que el DataFrame no esté vacío
+        if df.empty:
+            logger.warning("⚠️ DataFrame vacío, no se guardará archivo")
+            return False
+        
+        # Guardar archivo: JSON Lines por orjson si está disponible,
+        # con el mismo formato que produce pandas
+        content = None
+        if (orjson is not None and orient == "records" and lines 
+                and date_format == "iso"):
+            content = _to_json_lines(df)
+        
+        if content is not None:
+            # Una sola escritura con buffer grande
+            with _open_for_sequential_write(output_path) as f:
+                f.write(content)
+        else:
             df.to_json(
                 output_path, 
                 orient=orient, 
@@ -57,256 +153,773 @@ class DataUtils:
                 date_format=date_format,
                 force_ascii=False
             )
-            
-            # Verificar que se guardó correctamente
-            if output_path.exists() and output_path.stat().st_size > 0:
-                logger.info(f"✅ Archivo JSON guardado: {output_path} ({len(df)} registros)")
-                return True
-            else:
-                logger.error(f"❌ Error: archivo no se creó correctamente: {output_path}")
-                return False
-                
-        except PermissionError:
-            logger.error(f"❌ Sin permisos para escribir en: {output_path}")
-            return False
-        except Exception as e:
-            logger.error(f"❌ Error guardando JSON en {output_path}: {e}")
-            return False
-    
-    @staticmethod
-    def save_to_csv(df: pd.DataFrame, 
-                   output_path: Union[str, Path],
-                   index: bool = False) -> bool:
-        """
-        Guarda el DataFrame en formato CSV.
-        
-        Args:
-            df: DataFrame a guardar
-            output_path: Ruta del archivo de salida
-            index: Si incluir el índice en el archivo
-            
-        Returns:
-            bool: True si se guardó correctamente
-        """
-        try:
-            output_path = Path(output_path)
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            if df.empty:
-                logger.warning("⚠️ DataFrame vacío, no se guardará CSV")
-                return False
-            
-            df.to_csv(output_path, index=index)
-            logger.info(f"✅ Archivo CSV guardado: {output_path} ({len(df)} registros)")
+        
+        # Verificar que se guardó correctamente
+        if output_path.exists() and output_path.stat().st_size > 0:
+            logger.info("✅ Archivo JSON guardado: %s (%s registros)", output_path, len(df))
             return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error guardando CSV en {output_path}: {e}")
+        else:
+            logger.error("❌ Error: archivo no se creó correctamente: %s", output_path)
             return False
+            
+    except PermissionError:
+        logger.error("❌ Sin permisos para escribir en: %s", output_path)
+        return False
+    except Exception as e:
+        logger.error("❌ Error guardando JSON en %s: %s", output_path, e)
+        return False
+
+
+def _to_json_lines(df: pd.DataFrame) -> Optional[bytes]:
+    """
+    Serializa el DataFrame como JSON Lines usando orjson.
     
-    @staticmethod
-    def preview_data(df: pd.DataFrame, n: int = 5) -> None:
-        """
-        Muestra información resumida del DataFrame.
+    Reproduce la salida de `df.to_json(orient="records", lines=True,
+    date_format="iso")`: fechas ISO en UTC con milisegundos y floats
+    redondeados a JSON_DOUBLE_PRECISION decimales.
+    
+    Args:
+        df: DataFrame a serializar
+        
+    Returns:
+        bytes or None: Contenido del archivo, o None si alguna columna
+        no es serializable por orjson (se usa pandas en ese caso)
+    """
+    import pandas as pd
+    
+    # Convertir cada columna una sola vez a lista de valores Python
+    names = [str(col) for col in df.columns]
+    columns = []
+    for col in df.columns:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            suffix = ""
+            if values.dt.tz is not None:
+                values = values.dt.tz_convert("UTC").dt.tz_localize(None)
+                suffix = "Z"
+            # datetime64[ms] -> str ya da el formato ISO con milisegundos
+            text = values.to_numpy().astype("datetime64[ms]").astype(str)
+            text = pd.Series(text, index=df.index, dtype=object) + suffix
+            columns.append(text.where(values.notna(), None).tolist())
+        elif pd.api.types.is_float_dtype(values):
+            values = values.astype("float64").round(JSON_DOUBLE_PRECISION)
+            columns.append(values.tolist())
+        else:
+            columns.append(values.tolist())
+    
+    # Armar cada registro recorriendo las columnas en paralelo
+    try:
+        return b"".join(
+            orjson.dumps(dict(zip(names, row))) + b"\n"
+            for row in zip(*columns)
+        )
+    except TypeError:
+        return None
+
+
+def save_to_csv(df: pd.DataFrame, 
+                output_path: Union[str, Path],
+                index: bool = False,
+                chunk_size: int = CSV_CHUNK_SIZE) -> bool:
+    """
+    Guarda el DataFrame en formato CSV.
+    
+    Args:
+        df: DataFrame a guardar
+        output_path: Ruta del archivo de salida
+        index: Si incluir el índice en el archivo
+        chunk_size: Filas por bloque; DataFrames más grandes se escriben
+            por bloques para no materializar todo el CSV en memoria
+        
+    Returns:
+        bool: True si se guardó correctamente
+    """
+    try:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        Args:
-            df: DataFrame a previsualizar
-            n: Número de filas a mostrar
-        """
-        if df.empty:
-            print("DataFrame vacío")
-            return
-        
-        print(f"📊 Vista previa de datos ({len(df)} registros total):")
-        print("-" * 60)
-        print(df.head(n))
-        print(f"ℹ️ Forma: {df.shape} | Columnas: {list(df.columns)}")
-        
-        # Mostrar tipos de datos
-        print("📋 Tipos de datos:")
-        for col, dtype in df.dtypes.items():
-            null_count = df[col].isnull().sum()
-            null_pct = (null_count / len(df)) * 100
-            print(f"  {col}: {dtype} (nulos: {null_count}, {null_pct:.1f}%)")
-    
-    @staticmethod
-    def validate_columns(df: pd.DataFrame, 
-                        expected_columns: List[str],
-                        strict: bool = False) -> bool:
-        """
-        Valida las columnas del DataFrame.
-        
-        Args:
-            df: DataFrame a validar
-            expected_columns: Lista de columnas esperadas
-            strict: Si True, no permite columnas adicionales
-            
-        Returns:
-            bool: True si la validación pasa
-        """
         if df.empty:
-            logger.warning("⚠️ No se puede validar DataFrame vacío")
+            logger.warning("⚠️ DataFrame vacío, no se guardará CSV")
             return False
         
-        # Verificar columnas faltantes
-        missing = [col for col in expected_columns if col not in df.columns]
-        if missing:
-            logger.error(f"❌ Faltan columnas requeridas: {missing}")
+        with _open_for_sequential_write(output_path) as f:
+            if len(df) <= chunk_size:
+                df.to_csv(f, index=index)
+            else:
+                for start in range(0, len(df), chunk_size):
+                    df.iloc[start:start + chunk_size].to_csv(
+                        f, index=index, header=(start == 0)
+                    )
+        logger.info("✅ Archivo CSV guardado: %s (%s registros)", output_path, len(df))
+        return True
+        
+    except Exception as e:
+        logger.error("❌ Error guardando CSV en %s: %s", output_path, e)
+        return False
+
+
+def load_csv_batched(file_path: Union[str, Path],
+                     chunk_size: int = CSV_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """
+    Lee un CSV por bloques, sin cargarlo completo en memoria.
+    
+    Args:
+        file_path: Ruta del archivo CSV
+        chunk_size: Filas por bloque
+        
+    Yields:
+        pd.DataFrame: Cada bloque del archivo
+    """
+    import pandas as pd
+    
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        logger.error("❌ Archivo no encontrado: %s", file_path)
+        return
+    
+    try:
+        with pd.read_csv(file_path, chunksize=chunk_size) as reader:
+            yield from reader
+    except Exception as e:
+        logger.error("❌ Error cargando CSV desde %s: %s", file_path, e)
+
+
+def load_csv(file_path: Union[str, Path],
+             usecols: Optional[List[str]] = None,
+             dtype: Optional[Dict[str, Any]] = None) -> Optional[pd.DataFrame]:
+    """
+    Carga un CSV completo con el lector multihilo de pyarrow.
+    
+    Devuelve dtypes de Arrow, como load_parquet. Sin pyarrow se usa el
+    motor C de pandas.
+    
+    Args:
+        file_path: Ruta del archivo CSV
+        usecols: Columnas a leer (None = todas); el resto no se parsea
+        dtype: Tipos por columna, para evitar la inferencia
+        
+    Returns:
+        pd.DataFrame or None: Datos cargados o None si hay error
+    """
+    import pandas as pd
+    
+    file_path = Path(file_path)
+    
+    if not file_path.exists():
+        logger.error("❌ Archivo no encontrado: %s", file_path)
+        return None
+    
+    try:
+        try:
+            df = pd.read_csv(file_path, usecols=usecols, dtype=dtype,
+                             engine="pyarrow", dtype_backend="pyarrow")
+        except ImportError:
+            df = pd.read_csv(file_path, usecols=usecols, dtype=dtype)
+        
+        logger.info("✅ Archivo cargado: %s (%s registros)", file_path, len(df))
+        return df
+        
+    except Exception as e:
+        logger.error("❌ Error cargando CSV desde %s: %s", file_path, e)
+        return None
+
+
+def save_to_parquet(df: pd.DataFrame, 
+                    output_path: Union[str, Path],
+                    compression: str = "zstd",
+                    level: int = 3) -> bool:
+    """
+    Guarda el DataFrame en formato Parquet (columnar, tipado y comprimido).
+    
+    Args:
+        df: DataFrame a guardar
+        output_path: Ruta del archivo de salida
+        compression: Algoritmo de compresión ('zstd', 'snappy', etc.)
+        level: Nivel de compresión
+        
+    Returns:
+        bool: True si se guardó correctamente
+    """
+    import pandas as pd
+    
+    try:
+        output_path = Path(output_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        if df.empty:
+            logger.warning("⚠️ DataFrame vacío, no se guardará Parquet")
             return False
         
-        # Verificar columnas extra (solo en modo strict)
-        if strict:
-            extra = [col for col in df.columns if col not in expected_columns]
-            if extra:
-                logger.error(f"❌ Columnas no esperadas: {extra}")
-                return False
+        # Guardar fechas como TIMESTAMP de Arrow y no como texto
+        if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+            df = df.assign(date=pd.to_datetime(df['date']))
         
-        logger.info("✅ Validación de columnas exitosa")
+        df.to_parquet(
+            output_path, 
+            engine="pyarrow", 
+            compression=compression, 
+            compression_level=level, 
+            index=False
+        )
+        logger.info("✅ Archivo Parquet guardado: %s (%s registros)", output_path, len(df))
         return True
+        
+    except Exception as e:
+        logger.error("❌ Error guardando Parquet en %s: %s", output_path, e)
+        return False
+
+
+def load_parquet(file_path: Union[str, Path],
+                 columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """
+    Carga datos desde archivo Parquet con dtypes de Arrow (sin copiar a objetos).
     
-    @staticmethod
-    def validate_data_quality(df: pd.DataFrame, 
-                            location_name: str = "unknown") -> Dict[str, Any]:
-        """
-        Realiza validación de calidad de datos meteorológicos.
+    Args:
+        file_path: Ruta del archivo Parquet
+        columns: Columnas a leer (None = todas)
         
-        Args:
-            df: DataFrame a validar
-            location_name: Nombre de la ubicación para logging
-            
-        Returns:
-            dict: Reporte de calidad de datos
-        """
-        if df.empty:
-            return {"status": "error", "message": "DataFrame vacío"}
+    Returns:
+        pd.DataFrame or None: Datos cargados o None si hay error
+    """
+    import pandas as pd
+    
+    try:
+        import pyarrow.parquet as pq
         
-        logger.info(f"Validando calidad de datos para {location_name}")
+        file_path = Path(file_path)
         
-        report = {
-            "location": location_name,
-            "total_records": len(df),
-            "date_range": None,
-            "missing_data": {},
-            "data_issues": [],
-            "status": "ok"
+        if not file_path.exists():
+            logger.error("❌ Archivo no encontrado: %s", file_path)
+            return None
+        
+        table = pq.read_table(file_path, columns=columns)
+        df = table.to_pandas(types_mapper=pd.ArrowDtype)
+        
+        logger.info("✅ Archivo cargado: %s (%s registros)", file_path, len(df))
+        return df
+        
+    except Exception as e:
+        logger.error("❌ Error cargando Parquet desde %s: %s", file_path, e)
+        return None
+
+
+def preview_data(df: pd.DataFrame, n: int = 5) -> None:
+    """
+    Muestra información resumida del DataFrame.
+    
+    Args:
+        df: DataFrame a previsualizar
+        n: Número de filas a mostrar
+    """
+    if df.empty:
+        print("DataFrame vacío")
+        return
+    
+    print(f"📊 Vista previa de datos ({len(df)} registros total):")
+    print("-" * 60)
+    print(df.head(n))
+    print(f"ℹ️ Forma: {df.shape} | Columnas: {list(df.columns)}")
+    
+    # Mostrar tipos de datos
+    print("📋 Tipos de datos:")
+    null_counts = df.isna().sum()
+    for col, dtype in df.dtypes.items():
+        null_count = null_counts[col]
+        null_pct = (null_count / len(df)) * 100
+        print(f"  {col}: {dtype} (nulos: {null_count}, {null_pct:.1f}%)")
+
+
+@lru_cache(maxsize=32)
+def _column_differences(columns: tuple, expected_columns: tuple) -> tuple:
+    """
+    Columnas faltantes (en el orden esperado) y extra (en el del DataFrame).
+    
+    Cacheado: el pipeline valida el mismo esquema una y otra vez.
+    """
+    expected = set(expected_columns)
+    present = set(columns)
+    return (tuple(col for col in expected_columns if col not in present), 
+            tuple(col for col in columns if col not in expected))
+
+
+def validate_columns(df: pd.DataFrame, 
+                     expected_columns: List[str],
+                     strict: bool = False) -> bool:
+    """
+    Valida las columnas del DataFrame.
+    
+    Args:
+        df: DataFrame a validar
+        expected_columns: Lista de columnas esperadas
+        strict: Si True, no permite columnas adicionales
+        
+    Returns:
+        bool: True si la validación pasa
+    """
+    if df.empty:
+        logger.warning("⚠️ No se puede validar DataFrame vacío")
+        return False
+    
+    missing, extra = _column_differences(tuple(df.columns), tuple(expected_columns))
+    
+    # Verificar columnas faltantes
+    if missing:
+        logger.error("❌ Faltan columnas requeridas: %s", list(missing))
+        return False
+    
+    # Verificar columnas extra (solo en modo strict)
+    if strict and extra:
+        logger.error("❌ Columnas no esperadas: %s", list(extra))
+        return False
+    
+    logger.info("✅ Validación de columnas exitosa")
+    return True
+
+
+def validate_data_quality(df: pd.DataFrame, 
+                          location_name: str = "unknown") -> Dict[str, Any]:
+    """
+    Realiza validación de calidad de datos meteorológicos.
+    
+    Args:
+        df: DataFrame a validar
+        location_name: Nombre de la ubicación para logging
+        
+    Returns:
+        dict: Reporte de calidad de datos
+    """
+    import numpy as np
+    import pandas as pd
+    
+    if df.empty:
+        return {"status": "error", "message": "DataFrame vacío"}
+    
+    logger.info("Validando calidad de datos para %s", location_name)
+    
+    report = {
+        "location": location_name,
+        "total_records": len(df),
+        "date_range": None,
+        "missing_data": {},
+        "data_issues": [],
+        "status": "ok"
+    }
+    
+    # Validar fechas
+    if 'date' in df.columns:
+        try:
+            # Variable local: no modificar el DataFrame del llamador
+            dates = df['date']
+            if not pd.api.types.is_datetime64_any_dtype(dates):
+                dates = pd.to_datetime(dates, cache=True)
+            report["date_range"] = {
+                "start": dates.min().strftime("%Y-%m-%d"),
+                "end": dates.max().strftime("%Y-%m-%d")
+            }
+        except Exception as e:
+            report["data_issues"].append(f"Error en fechas: {e}")
+    
+    # Validar valores faltantes (una sola reducción para todo el DataFrame)
+    null_counts = df.isna().sum()
+    total = len(df)
+    for col, null_count in null_counts[null_counts > 0].items():
+        null_pct = (null_count / total) * 100
+        report["missing_data"][col] = {
+            "count": null_count,
+            "percentage": round(null_pct, 2)
         }
         
-        # Validar fechas
-        if 'date' in df.columns:
-            try:
-                df['date'] = pd.to_datetime(df['date'])
-                report["date_range"] = {
-                    "start": df['date'].min().strftime("%Y-%m-%d"),
-                    "end": df['date'].max().strftime("%Y-%m-%d")
-                }
-            except Exception as e:
-                report["data_issues"].append(f"Error en fechas: {e}")
-        
-        # Validar valores faltantes
-        for col in df.columns:
-            null_count = df[col].isnull().sum()
-            if null_count > 0:
-                null_pct = (null_count / len(df)) * 100
-                report["missing_data"][col] = {
-                    "count": null_count,
-                    "percentage": round(null_pct, 2)
-                }
-                
-                if null_pct > 10:  # Más del 10% de datos faltantes
-                    report["data_issues"].append(
-                        f"{col}: {null_pct:.1f}% datos faltantes"
-                    )
+        if null_pct > 10:  # Más del 10% de datos faltantes
+            report["data_issues"].append(
+                f"{col}: {null_pct:.1f}% datos faltantes"
+            )
+    
+    # Validar rangos de temperatura (si existen)
+    for col in TEMPERATURE_COLUMNS:
+        if col in df.columns:
+            # Arrays en su dtype original (float32 del cliente o int16 de
+            # compress_weather, sin copia): mínimo y máximo en lugar de dos
+            # máscaras booleanas; los límites se escalan solo si el DataFrame
+            # viene marcado por compress_weather (un int sin marca está en °C)
+            values = df[col]
+            scale = df.attrs.get(TEMPERATURE_SCALE_ATTR, 1)
+            if isinstance(values.dtype, np.dtype) and values.dtype.kind in 'if':
+                arr = values.to_numpy()
+            else:
+                arr = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            if arr.dtype.kind == 'f':
+                arr = arr[~np.isnan(arr)]
+            if arr.size and (arr.min() < -50 * scale or arr.max() > 60 * scale):
+                report["data_issues"].append(
+                    f"{col}: valores fuera de rango (-50°C a 60°C)"
+                )
+    
+    # Status final
+    if report["data_issues"]:
+        report["status"] = "warning"
+        logger.warning("⚠️ Problemas de calidad encontrados: %s", len(report['data_issues']))
+    else:
+        logger.info("✅ Calidad de datos validada correctamente")
+    
+    return report
+
+
+def compress_weather(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cuantiza las temperaturas a enteros de décimas de grado.
+    
+    Con precisión de 0.1 °C un int16 (2 bytes) guarda 10 × T; Parquet lo
+    comprime mejor que un float. Las columnas con faltantes usan Int16
+    (nullable). La copia queda marcada en df.attrs[TEMPERATURE_SCALE_ATTR]
+    para que validate_data_quality escale sus límites. No modifica el
+    DataFrame recibido.
+    
+    Args:
+        df: DataFrame con temperaturas en °C
         
-        # Validar rangos de temperatura (si existen)
-        temp_cols = ['temperature_2m_max', 'temperature_2m_min']
-        for col in temp_cols:
-            if col in df.columns:
-                values = df[col].dropna()
-                if not values.empty:
-                    if (values < -50).any() or (values > 60).any():
-                        report["data_issues"].append(
-                            f"{col}: valores fuera de rango (-50°C a 60°C)"
-                        )
-        
-        # Status final
-        if report["data_issues"]:
-            report["status"] = "warning"
-            logger.warning(f"⚠️ Problemas de calidad encontrados: {len(report['data_issues'])}")
+    Returns:
+        pd.DataFrame: Copia con las temperaturas en décimas de grado
+    """
+    import pandas as pd
+    
+    quantized = {}
+    for col in TEMPERATURE_COLUMNS:
+        if col in df.columns and pd.api.types.is_float_dtype(df[col]):
+            scaled = (df[col] * TEMPERATURE_SCALE).round()
+            quantized[col] = scaled.astype('Int16' if scaled.isna().any() else 'int16')
+    
+    if not quantized:
+        return df
+    
+    compressed = df.assign(**quantized)
+    compressed.attrs[TEMPERATURE_SCALE_ATTR] = TEMPERATURE_SCALE
+    return compressed
+
+
+def decompress_weather(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Revierte compress_weather: temperaturas de décimas de grado a °C.
+    
+    Solo actúa sobre DataFrames marcados por compress_weather; cualquier
+    otro se devuelve sin cambios.
+    
+    Args:
+        df: DataFrame con temperaturas en décimas de grado
+        
+    Returns:
+        pd.DataFrame: Copia con las temperaturas en °C (float32, faltantes como NaN)
+    """
+    import numpy as np
+    import pandas as pd
+    
+    scale = df.attrs.get(TEMPERATURE_SCALE_ATTR)
+    if scale is None:
+        return df
+    
+    restored = {}
+    for col in TEMPERATURE_COLUMNS:
+        if col in df.columns and pd.api.types.is_integer_dtype(df[col]):
+            values = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+            restored[col] = values / np.float32(scale)
+    
+    decompressed = df.assign(**restored)
+    del decompressed.attrs[TEMPERATURE_SCALE_ATTR]
+    return decompressed
+
+
+def generate_filename(location_name: str, 
+                      data_type: str = "weather",
+                      extension: str = "json") -> str:
+    """
+    Genera nombre de archivo estandarizado.
+    
+    Args:
+        location_name: Nombre de la ubicación
+        data_type: Tipo de datos ('weather', 'forecast', etc.)
+        extension: Extensión del archivo
+        
+    Returns:
+        str: Nombre de archivo generado
+    """
+    timestamp = _date_stamp(date.today())
+    if location_name.isascii():
+        clean_location = location_name.translate(_FILENAME_TRANS)
+    else:
+        clean_location = location_name.lower().replace(" ", "_")
+    
+    return f"{data_type}_{clean_location}_{timestamp}.{extension}"
+
+
+def _apply_json_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Aplica el esquema de los archivos del proyecto, igual con cualquier lector.
+    
+    La fecha pasa a datetime (texto ISO 8601, o epoch en milisegundos como
+    lo escribe to_json) y las variables diarias toman el dtype de
+    WeatherConfig.DAILY_DTYPES, como en el cliente de la API. Las demás
+    columnas quedan como las leyó el lector: no se infieren tipos por nombre.
+    
+    Args:
+        df: DataFrame recién parseado
+        
+    Returns:
+        pd.DataFrame: DataFrame con el esquema aplicado
+    """
+    import pandas as pd
+    from .config import WeatherConfig
+    
+    if 'date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['date']):
+        if pd.api.types.is_numeric_dtype(df['date']):
+            df['date'] = pd.to_datetime(df['date'], unit='ms')
         else:
-            logger.info("✅ Calidad de datos validada correctamente")
+            df['date'] = pd.to_datetime(df['date'])
+    
+    dtypes = {
+        col: dtype for col, dtype in WeatherConfig.DAILY_DTYPES.items() 
+        if col in df.columns
+    }
+    return df.astype(dtypes) if dtypes else df
+
+
+def _to_arrow_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convierte columnas de texto y fecha a dtypes de Arrow.
+    
+    Los buffers contiguos de Arrow vectorizan isna, min y max, y se
+    escriben a Parquet sin copia; las columnas numéricas no cambian.
+    
+    Args:
+        df: DataFrame cargado
         
-        return report
+    Returns:
+        pd.DataFrame: DataFrame con location/date (y demás texto) en Arrow
+    """
+    import pandas as pd
     
-    @staticmethod
-    def generate_filename(location_name: str, 
-                         data_type: str = "weather",
-                         extension: str = "json") -> str:
-        """
-        Genera nombre de archivo estandarizado.
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return df
+    
+    conversions = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.ArrowDtype):
+            continue
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            if isinstance(dtype, pd.DatetimeTZDtype):
+                arrow_type = pa.timestamp(dtype.unit, tz=str(dtype.tz))
+            else:
+                arrow_type = pa.from_numpy_dtype(dtype)
+            conversions[col] = pd.ArrowDtype(arrow_type)
+        elif (pd.api.types.is_string_dtype(dtype) 
+              and pd.api.types.infer_dtype(df[col], skipna=True) == 'string'):
+            conversions[col] = pd.ArrowDtype(pa.string())
+    
+    return df.astype(conversions) if conversions else df
+
+
+def _load_json_lines_arrow(file_path: Path) -> Optional[pd.DataFrame]:
+    """
+    Carga un archivo JSON Lines con pyarrow.json (parseo multihilo por bloques).
+    
+    Args:
+        file_path: Ruta del archivo
         
-        Args:
-            location_name: Nombre de la ubicación
-            data_type: Tipo de datos ('weather', 'forecast', etc.)
-            extension: Extensión del archivo
-            
-        Returns:
-            str: Nombre de archivo generado
-        """
-        from datetime import datetime
+    Returns:
+        pd.DataFrame or None: Datos cargados, o None si el archivo no es
+        JSON Lines válido para Arrow (array JSON, tipos mezclados en una
+        columna); en ese caso se usa orjson
         
-        timestamp = datetime.now().strftime("%Y%m%d")
-        clean_location = location_name.lower().replace(" ", "_")
+    Raises:
+        ImportError: Si pyarrow no está instalado
+    """
+    import pyarrow as pa
+    import pyarrow.json as paj
+    
+    read_options = paj.ReadOptions(use_threads=True, block_size=8 << 20)
+    
+    try:
+        table = paj.read_json(file_path, read_options=read_options)
         
-        return f"{data_type}_{clean_location}_{timestamp}.{extension}"
+        # Arrow infiere timestamps (sin zona horaria) en cualquier columna de
+        # texto ISO: se vuelven a leer como texto para que el esquema y los
+        # demás lectores las traten igual
+        text_columns = {
+            field.name: pa.string() for field in table.schema
+            if pa.types.is_timestamp(field.type)
+        }
+        if text_columns:
+            table = paj.read_json(
+                file_path,
+                read_options=read_options,
+                parse_options=paj.ParseOptions(explicit_schema=pa.schema(text_columns))
+            ).select(table.column_names)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Solo errores de contenido; los de E/S siguen a load_json_data
+        return None
+    
+    df = _apply_json_schema(table.to_pandas(types_mapper=_arrow_types_mapper))
+    return _to_arrow_dtypes(df)
+
+
+def _load_json_lines_parallel(file_path: Path, 
+                              workers: Optional[int] = None) -> Optional[pd.DataFrame]:
+    """
+    Carga un archivo JSON Lines grande parseando bloques en paralelo.
     
-    @staticmethod
-    def load_json_data(file_path: Union[str, Path]) -> Optional[pd.DataFrame]:
-        """
-        Carga datos desde archivo JSON.
+    Divide el archivo mapeado en memoria en tantos bloques como workers,
+    con cada corte ajustado al siguiente salto de línea, y parsea cada
+    bloque con orjson en un proceso distinto. Es la alternativa al lector
+    de Arrow cuando pyarrow no está instalado.
+    
+    Args:
+        file_path: Ruta del archivo JSON Lines
+        workers: Número de procesos (None = cantidad de CPUs)
         
-        Args:
-            file_path: Ruta del archivo JSON
-            
-        Returns:
-            pd.DataFrame or None: Datos cargados o None si hay error
-        """
-        try:
-            file_path = Path(file_path)
+    Returns:
+        pd.DataFrame or None: Datos cargados, o None si orjson no está
+        disponible o el archivo no es JSON Lines (es un array JSON);
+        load_json_data cae entonces a la lectura única
+    """
+    import pandas as pd
+    
+    if orjson is None:
+        return None
+    
+    workers = workers or os.cpu_count() or 1
+    
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            size = len(mm)
             
-            if not file_path.exists():
-                logger.error(f"❌ Archivo no encontrado: {file_path}")
+            # Un array JSON no se puede cortar por líneas
+            first = 0
+            while first < size and mm[first:first + 1].isspace():
+                first += 1
+            if mm[first:first + 1] == b'[':
                 return None
             
-            # Detectar si es JSON Lines o JSON normal
-            with open(file_path, 'r') as f:
-                first_line = f.readline().strip()
-            
-            if first_line.startswith('['):
-                # JSON normal
-                df = pd.read_json(file_path)
-            else:
-                # JSON Lines
-                df = pd.read_json(file_path, lines=True)
-            
-            logger.info(f"✅ Archivo cargado: {file_path} ({len(df)} registros)")
-            return df
-            
-        except Exception as e:
-            logger.error(f"❌ Error cargando JSON desde {file_path}: {e}")
+            # Cortes alineados al siguiente '\n'
+            bounds = [0]
+            for i in range(1, workers):
+                cut = mm.find(b'\n', max(size * i // workers, bounds[-1]))
+                if cut == -1:
+                    break
+                bounds.append(cut + 1)
+            bounds.append(size)
+    
+    ranges = [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+    
+    with ProcessPoolExecutor(max_workers=len(ranges)) as executor:
+        frames = list(executor.map(
+            _parse_json_lines_chunk,
+            [str(file_path)] * len(ranges),
+            [start for start, _ in ranges],
+            [end for _, end in ranges]
+        ))
+    
+    df = _apply_json_schema(pd.concat(frames, ignore_index=True))
+    return _to_arrow_dtypes(df)
+
+
+def _load_json_pandas(file_path: Path) -> pd.DataFrame:
+    """Carga JSON con pandas.read_json (sin orjson disponible)."""
+    import pandas as pd
+    
+    # Un solo descriptor: se detecta el formato y se rebobina para pandas
+    with open(file_path, 'rb') as f:
+        first_char = f.read(1)
+        f.seek(0)
+        df = pd.read_json(f, lines=(first_char != b'['), 
+                          dtype=False, convert_dates=False)
+    df = _to_arrow_dtypes(_apply_json_schema(df))
+    
+    logger.info("✅ Archivo cargado: %s (%s registros)", file_path, len(df))
+    return df
+
+
+def load_json_data(file_path: Union[str, Path]) -> Optional[pd.DataFrame]:
+    """
+    Carga datos desde archivo JSON.
+    
+    Las columnas de texto y fecha se devuelven con dtypes de Arrow,
+    igual que load_parquet.
+    
+    Args:
+        file_path: Ruta del archivo JSON
+        
+    Returns:
+        pd.DataFrame or None: Datos cargados o None si hay error
+    """
+    import pandas as pd
+    
+    try:
+        file_path = Path(file_path)
+        
+        if not file_path.exists():
+            logger.error("❌ Archivo no encontrado: %s", file_path)
             return None
+        
+        # JSON Lines: lector multihilo de Arrow, directo a columnas. Si
+        # Arrow rechaza el archivo (array JSON, tipos mezclados) el parseo
+        # por bloques también lo haría: se pasa directo a la lectura única
+        try:
+            df = _load_json_lines_arrow(file_path)
+        except ImportError:
+            # Sin pyarrow: archivos grandes parseados en paralelo sobre mmap
+            df = None
+            if file_path.stat().st_size >= PARALLEL_PARSE_MIN_BYTES:
+                df = _load_json_lines_parallel(file_path)
+        
+        if df is not None:
+            logger.info("✅ Archivo cargado: %s (%s registros)", file_path, len(df))
+            return df
+        
+        if orjson is None:
+            return _load_json_pandas(file_path)
+        
+        # Una sola lectura del archivo: detectar formato sobre los bytes
+        data = file_path.read_bytes()
+        
+        if data.lstrip()[:1] == b'[':
+            # JSON normal
+            records = orjson.loads(data)
+        else:
+            # JSON Lines
+            records = [orjson.loads(line) for line in data.splitlines() if line.strip()]
+        
+        df = _apply_json_schema(pd.DataFrame.from_records(records))
+        df = _to_arrow_dtypes(df)
+        
+        logger.info("✅ Archivo cargado: %s (%s registros)", file_path, len(df))
+        return df
+        
+    except Exception as e:
+        logger.error("❌ Error cargando JSON desde %s: %s", file_path, e)
+        return None
 
-# Funciones de conveniencia para mantener compatibilidad
-def save_to_json(df: pd.DataFrame, output_path: str) -> None:
-    """Función de compatibilidad - DEPRECATED"""
-    logger.warning("⚠️ Usando función deprecated. Considera migrar a DataUtils.save_to_json()")
-    DataUtils.save_to_json(df, output_path)
 
-def preview_data(df: pd.DataFrame, n: int = 5) -> None:
-    """Función de compatibilidad - DEPRECATED"""
-    logger.warning("⚠️ Usando función deprecated. Considera migrar a DataUtils.preview_data()")
-    DataUtils.preview_data(df, n)
-
-def validate_columns(df: pd.DataFrame, expected_columns: list) -> bool:
-    """Función de compatibilidad - DEPRECATED"""
-    logger.warning("⚠️ Usando función deprecated. Considera migrar a DataUtils.validate_columns()")
-    return DataUtils.validate_columns(df, expected_columns)
\ No newline at end of file
+class DataUtils:
+    """
+    Utilidades para manejo y validación de datos meteorológicos.
+    
+    Fachada sobre las funciones públicas del módulo:
+    `DataUtils.save_to_json(...)` sigue funcionando, y el código caliente
+    puede usar `from weather_data_collector.utils import save_to_json` y
+    evitar la búsqueda de atributo y el descriptor.
+    """
+    
+    save_to_json = staticmethod(save_to_json)
+    save_to_csv = staticmethod(save_to_csv)
+    load_csv = staticmethod(load_csv)
+    load_csv_batched = staticmethod(load_csv_batched)
+    save_to_parquet = staticmethod(save_to_parquet)
+    load_parquet = staticmethod(load_parquet)
+    preview_data = staticmethod(preview_data)
+    validate_columns = staticmethod(validate_columns)
+    validate_data_quality = staticmethod(validate_data_quality)
+    compress_weather = staticmethod(compress_weather)
+    decompress_weather = staticmethod(decompress_weather)
+    generate_filename = staticmethod(generate_filename)
+    load_json_data = staticmethod(load_json_data)